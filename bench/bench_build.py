@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark: peak memory and time of build_pages as the archive grows.
+
+Usage: python bench/bench_build.py [--sizes 1000,10000,100000] [--words 800]
+
+For each size, writes that many synthetic posts into a throwaway copy of the
+site and runs, each in a fresh process so peak RSS is its own:
+  load_posts   the old first stage: every post parsed and rendered into one list
+  build        build_pages, which streams post pages and keeps only PostMeta records
+  rebuild      build_pages twice in one process (as generate.py daemon does);
+               the time shown is the second, nothing-changed build
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+WORDS = ("cipher puzzle pattern signal clue lattice riddle archive lantern key ledger vault "
+         "sequence grid trail marker compass relic hidden decode").split()
+CATEGORIES = ["Cipher Dispatch", "Pattern Brief", "Deep Decode", "Field Notes"]
+
+
+def _paragraph(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_site(root, count, words, seed=0):
+    """A site copy with `count` synthetic posts of about `words` words each."""
+    for name in ("config", "templates"):
+        shutil.copytree(os.path.join(REPO_ROOT, name), os.path.join(root, name))
+    posts_dir = os.path.join(root, "content", "posts")
+    os.makedirs(posts_dir)
+    rng = random.Random(seed)
+    start = time.mktime((2020, 1, 1, 0, 0, 0, 0, 0, -1))
+    for i in range(count):
+        date = time.strftime("%Y-%m-%d", time.localtime(start + i * 3600))
+        body = []
+        for section in range(4):
+            body.append(f"## {_paragraph(rng, 4)[:-1]}\n")
+            body.append(_paragraph(rng, words // 8) + " **" + rng.choice(WORDS) + "** and `" + rng.choice(WORDS) + "`.\n")
+            body.append("\n".join(f"- {_paragraph(rng, 6)}" for _ in range(3)) + "\n")
+            body.append(_paragraph(rng, words // 8) + "\n")
+        with open(os.path.join(posts_dir, f"{date}-post-{i}.md"), "w", encoding="utf-8") as f:
+            f.write(f'---\ntitle: "{_paragraph(rng, 6)[:-1]}"\ndate: "{date}"\n'
+                    f'category: "{rng.choice(CATEGORIES)}"\nexcerpt: "{_paragraph(rng, 20)}"\n'
+                    f'tags: "{rng.choice(WORDS)}, {rng.choice(WORDS)}"\n---\n\n' + "\n".join(body))
+
+
+def load_posts(root):
+    """The old first stage of the build, kept here as the baseline: every post parsed and rendered into one list."""
+    import build
+    posts_dir = os.path.join(root, "content", "posts")
+    posts = []
+    for fname in os.listdir(posts_dir):
+        if not fname.endswith(".md"):
+            continue
+        with open(os.path.join(posts_dir, fname), "r", encoding="utf-8") as f:
+            meta, body = build.parse_frontmatter(f.read())
+        if not meta.get("title"):
+            continue
+        post = build.PostMeta(fname, meta).as_dict()
+        post.update(body_md=body, body_html=build.markdown_to_html(body))
+        posts.append(post)
+    posts.sort(key=lambda p: p["date"], reverse=True)
+    return posts
+
+
+def child(mode, root):
+    """Run one measurement in this process and print it as JSON."""
+    import contextlib
+    import io
+    import build
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "load_posts":
+            load_posts(root)
+        else:
+            build.build_pages(root)
+            if mode == "rebuild":
+                started = time.perf_counter()
+                build.build_pages(root)
+    elapsed = time.perf_counter() - started
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    print(json.dumps({"mode": mode, "seconds": round(elapsed, 2), "peak_rss_mib": round(peak_kib / 1024, 1)}))
+
+
+def measure(mode, root):
+    out = subprocess.run([sys.executable, __file__, "--child", mode, root],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming build memory benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated post counts")
+    parser.add_argument("--words", type=int, default=800, help="Approximate words per post")
+    parser.add_argument("--modes", default="load_posts,build,rebuild")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "ROOT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    modes = args.modes.split(",")
+    print(f"  {'posts':>7} {'content MiB':>11}  " + "  ".join(f"{m + ' s':>12} {m + ' MiB':>14}" for m in modes))
+    for size in (int(s) for s in args.sizes.split(",")):
+        root = tempfile.mkdtemp(prefix="bench-build-")
+        try:
+            make_site(root, size, args.words)
+            posts_dir = os.path.join(root, "content", "posts")
+            content_mib = sum(e.stat().st_size for e in os.scandir(posts_dir)) / 2 ** 20
+            results = []
+            for mode in modes:
+                results.append(measure(mode, root))
+                shutil.rmtree(os.path.join(root, "posts"), ignore_errors=True)
+            print(f"  {size:>7} {content_mib:>11.1f}  " + "  ".join(
+                f"{r['seconds']:>12.2f} {r['peak_rss_mib']:>14.1f}" for r in results), flush=True)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Benchmark: full generation cycles run offline against local stand-ins.
+
+Usage: python bench/bench_cycle.py [--cycles N] [--latency S] [--failure-rate P] [--json out.json]
+
+Copies the repository into a temporary git repo, points every source at
+bench/stand_ins.py and the Claude client at bench/fake_claude.py, then runs
+generate.run_cycle N times (committing locally; the repo has no remote). Each cycle's
+trace.json is read back to report per-span latency (mean/p50/max) and
+overall throughput, so changes to any stage can be measured end to end
+without network access or API spend.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+import claude_client
+import fetch_sources
+import generate
+from checkpoint import runs_dir
+from fake_claude import FakeClaude
+from stand_ins import SourceStandIns, bench_sources
+
+COPY_IGNORE = shutil.ignore_patterns(".git", ".cache", "__pycache__", "bench", "requests.jsonl")
+SYLLABLES = "ka lo mi ru te va zo ne pi da so fu ri ke ba".split()
+
+
+def _word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(3))
+
+
+class BenchResponder:
+    """Fake Claude replies for each cycle step, with a fresh topic every cycle."""
+
+    def __init__(self, seed=0, post_words=900):
+        self.rng = random.Random(seed)
+        self.post_words = post_words
+        self.topic = None
+
+    def __call__(self, payload):
+        user = payload["messages"][-1]["content"]
+        if "Pick a topic" in user:
+            # Invented words never appear in earlier posts, so the novelty check passes
+            self.topic = " ".join(_word(self.rng) for _ in range(3)).title()
+            return json.dumps({"topic": self.topic, "angle": f"Why {_word(self.rng)} matters",
+                               "category": "Puzzles", "format": "medium", "source_items": []})
+        if "Reflect and return" in user:
+            return json.dumps({"soul_updates": {"add_interests": [self.topic]},
+                               "memory_updates": {"key_findings": [{"finding": f"{self.topic} holds up",
+                                                                    "post": self.topic}]}})
+        body = " ".join(_word(self.rng) for _ in range(self.post_words))
+        return (f'---\ntitle: "{self.topic}"\ndate: "{time.strftime("%Y-%m-%d")}"\ncategory: "Puzzles"\n'
+                f'excerpt: "A look at {self.topic}."\ntags: "bench, {_word(self.rng)}"\n---\n\n'
+                f"## {self.topic}\n\n{body}\n")
+
+
+def make_site(sources, workdir):
+    """A throwaway git repo holding a copy of this site, with sources.json replaced."""
+    site = os.path.join(workdir, "site")
+    shutil.copytree(REPO_ROOT, site, ignore=COPY_IGNORE)
+    with open(os.path.join(site, "config", "sources.json"), "w", encoding="utf-8") as f:
+        json.dump({"sources": sources}, f, indent=2)
+    env = dict(os.environ, GIT_AUTHOR_NAME="bench", GIT_AUTHOR_EMAIL="bench@localhost",
+               GIT_COMMITTER_NAME="bench", GIT_COMMITTER_EMAIL="bench@localhost")
+    for args in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "bench baseline"]):
+        subprocess.run(["git", *args], cwd=site, env=env, check=True)
+    os.environ.update({k: env[k] for k in ("GIT_AUTHOR_NAME", "GIT_AUTHOR_EMAIL",
+                                           "GIT_COMMITTER_NAME", "GIT_COMMITTER_EMAIL")})
+    return site
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def aggregate(traces):
+    """Per-span {count, mean_ms, p50_ms, max_ms} keyed by "category:name"."""
+    durations = {}
+    for events in traces:
+        for e in events:
+            if e.get("ph") == "X":
+                key = e["name"] if e["name"].startswith(f"{e['cat']}:") else f"{e['cat']}:{e['name']}"
+                durations.setdefault(key, []).append(e["dur"] / 1000)
+    return {key: {"count": len(ms), "mean_ms": round(statistics.fmean(ms), 2),
+                  "p50_ms": round(_percentile(ms, 0.5), 2), "max_ms": round(max(ms), 2)}
+            for key, ms in durations.items()}
+
+
+def run_cycles(site, cycles, max_age, verbose=False):
+    """Run the cycles; returns (wall seconds per cycle, trace events per cycle)."""
+    walls, traces = [], []
+    for n in range(cycles):
+        before = set(os.listdir(runs_dir(site))) if os.path.isdir(runs_dir(site)) else set()
+        out = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with out:
+            generate.run_cycle(site, "bench-key", dry_run=False, max_age_hours=max_age)
+        walls.append(time.perf_counter() - start)
+        (run_id,) = set(os.listdir(runs_dir(site))) - before
+        with open(os.path.join(runs_dir(site), run_id, "trace.json"), "r", encoding="utf-8") as f:
+            traces.append(json.load(f)["traceEvents"])
+        print(f"  cycle {n + 1}/{cycles}: {walls[-1]:.2f}s ({run_id})")
+    return walls, traces
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end cycle benchmark")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in source latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Extra random source latency (seconds)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of source requests answered 503")
+    parser.add_argument("--llm-first-token", type=float, default=0.2, help="Fake Claude time to first token")
+    parser.add_argument("--llm-token-delay", type=float, default=0.0, help="Fake Claude delay per streamed token")
+    parser.add_argument("--llm-cache", choices=claude_client.LLM_CACHE_MODES, default="off")
+    parser.add_argument("--max-age", type=float, default=generate.ITEM_MAX_AGE_HOURS,
+                        help="Item store reuse window in hours; 0 refetches every source every cycle")
+    parser.add_argument("--recorded", default=None, help="Directory of recorded responses to serve")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary site for inspection")
+    parser.add_argument("--verbose", action="store_true", help="Show the cycles' own output")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the results as JSON here")
+    args = parser.parse_args()
+
+    stand_ins = SourceStandIns(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+                               recorded_dir=args.recorded, seed=args.seed).start()
+    fake = FakeClaude(BenchResponder(args.seed), token_delay=args.llm_token_delay,
+                      first_token_delay=args.llm_first_token).start()
+    for name, value in stand_ins.env().items():
+        setattr(fetch_sources, name, value)
+    claude_client.CLAUDE_API_URL = fake.url
+    claude_client.LLM_CACHE_MODE = args.llm_cache
+
+    workdir = tempfile.mkdtemp(prefix="bench-cycle-")
+    try:
+        site = make_site(bench_sources(stand_ins.base_url), workdir)
+        print(f"Running {args.cycles} cycle(s) in {site}")
+        walls, traces = run_cycles(site, args.cycles, args.max_age, args.verbose)
+    finally:
+        stand_ins.stop()
+        fake.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    spans = aggregate(traces)
+    items = sum(e.get("args", {}).get("items", 0) for events in traces for e in events
+                if e.get("name") == "fetch_source")
+    fetch_seconds = sum(e["dur"] for events in traces for e in events if e.get("name") == "fetch") / 1e6
+    total = sum(walls)
+    results = {
+        "cycles": args.cycles,
+        "settings": {k: v for k, v in vars(args).items() if k not in ("json_path", "keep", "verbose")},
+        "cycle_seconds": {"mean": round(statistics.fmean(walls), 3), "p50": round(_percentile(walls, 0.5), 3),
+                          "max": round(max(walls), 3)},
+        "cycles_per_minute": round(60 * args.cycles / total, 2) if total else None,
+        "items_fetched": items,
+        "items_per_fetch_second": round(items / fetch_seconds, 1) if fetch_seconds else None,
+        "source_requests": stand_ins.requests,
+        "source_failures": stand_ins.failures,
+        "llm_requests": len(fake.requests),
+        "spans": spans,
+    }
+
+    print(f"\n  {'span':<32} {'n':>4} {'mean ms':>9} {'p50 ms':>9} {'max ms':>9}")
+    for key, s in sorted(spans.items(), key=lambda kv: -kv[1]["mean_ms"] * kv[1]["count"])[:25]:
+        print(f"  {key:<32} {s['count']:>4} {s['mean_ms']:>9.1f} {s['p50_ms']:>9.1f} {s['max_ms']:>9.1f}")
+    print(f"\n  Cycle time: mean {results['cycle_seconds']['mean']}s, max {results['cycle_seconds']['max']}s "
+          f"({results['cycles_per_minute']} cycles/min)")
+    print(f"  Fetched {items} items ({results['items_per_fetch_second']} items/s of fetch time); "
+          f"{stand_ins.requests} source requests, {stand_ins.failures} failed; {len(fake.requests)} Claude requests")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"  Results: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark: single-pass trending parser vs. the old per-repo regex scan.
+
+Usage: python bench/bench_trending.py [fixture.html ...] [--repeat N]
+
+Runs both extractors over saved GitHub trending pages (bench/fixtures/ by
+default), checks they agree on the repo list, and prints timings.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "scripts"))
+
+from fetch_sources import parse_github_trending
+
+
+def legacy_regex_extract(text, limit=15):
+    """The pre-parser extraction: one DOTALL search per repo over the whole page."""
+    results = []
+    matches = re.findall(r'<h2 class="h3 lh-condensed">\s*<a href="(/[^"]+)"', text)
+    if not matches:
+        matches = re.findall(r'href="(/[^/]+/[^"]+)"[^>]*class="[^"]*Link[^"]*"', text)
+    for path in matches[:limit]:
+        repo_name = path.strip("/")
+        desc_pattern = re.escape(path) + r'.*?<p class="[^"]*">\s*(.+?)\s*</p>'
+        desc_match = re.search(desc_pattern, text, re.DOTALL)
+        snippet = desc_match.group(1).strip() if desc_match else repo_name
+        snippet = re.sub(r'<[^>]+>', '', snippet).strip()
+        results.append((repo_name, snippet[:300]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trending extractor benchmark")
+    parser.add_argument("fixtures", nargs="*", help="Saved trending HTML pages")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per extractor")
+    args = parser.parse_args()
+
+    fixtures = args.fixtures or sorted(glob.glob(os.path.join(BENCH_DIR, "fixtures", "github_trending_*.html")))
+    for path in fixtures:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        records = parse_github_trending(text, limit=15)
+        legacy = legacy_regex_extract(text)
+
+        print(f"\n{os.path.basename(path)} ({len(text) / 1024:.0f} KiB)")
+        print(f"  parser: {len(records)} repos, legacy regex: {len(legacy)} repos")
+        parsed_names = [r["repo"] for r in records]
+        legacy_names = [name for name, _ in legacy]
+        if legacy_names and parsed_names != legacy_names:
+            print("  WARNING: repo lists differ")
+            print(f"    parser: {parsed_names}")
+            print(f"    legacy: {legacy_names}")
+        for r in records[:3]:
+            print(f"    {r['repo']} [{r['language'] or '-'}, {r['stars']} stars] {r['description'][:60]}")
+
+        t_parser = timeit.timeit(lambda: parse_github_trending(text, limit=15), number=args.repeat)
+        t_legacy = timeit.timeit(lambda: legacy_regex_extract(text), number=args.repeat)
+        print(f"  parser: {t_parser / args.repeat * 1000:8.2f} ms/page")
+        print(f"  legacy: {t_legacy / args.repeat * 1000:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
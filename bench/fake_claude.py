@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Claude Messages API, for offline runs of claude_client.
+
+Serves POST /v1/messages as plain JSON or as an SSE stream (when the request
+has "stream": true), with configurable per-token delay and injected failures
+(HTTP status with retry-after, an overloaded_error event mid-stream, or a
+stream that hangs up halfway without message_stop).
+
+Usage: python bench/fake_claude.py   — runs a self-check against claude_client
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "scripts"))
+
+
+def echo_responder(payload):
+    """Default responder: a short canned reply mentioning the prompt size."""
+    user = payload["messages"][-1]["content"]
+    size = len(user) if isinstance(user, str) else len(json.dumps(user))
+    return f"Fake reply to a {size}-character prompt from {payload.get('model')}."
+
+
+class FakeClaude:
+    """Configurable fake server. Failures are consumed in order, one per request."""
+
+    def __init__(self, responder=echo_responder, token_delay=0.0, first_token_delay=0.0):
+        self.responder = responder
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        # e.g. [{"status": 529, "retry_after": 1}, {"stream_error": "overloaded_error"}, {"hang_up": True}]
+        self.failures = []
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/v1/messages"
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length).decode("utf-8"))
+                with fake._lock:
+                    fake.requests.append(payload)
+                    failure = fake.failures.pop(0) if fake.failures else None
+                if failure and failure.get("status"):
+                    body = json.dumps({"type": "error", "error": {"type": "overloaded_error",
+                                                                  "message": "fake failure"}}).encode()
+                    self.send_response(failure["status"])
+                    if failure.get("retry_after") is not None:
+                        self.send_header("retry-after", str(failure["retry_after"]))
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                text = fake.responder(payload)
+                if payload.get("stream"):
+                    fake._stream(self, payload, text, failure)
+                else:
+                    fake._json(self, payload, text)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def _usage(self, payload, text):
+        system = payload.get("system", "")
+        prompt_chars = len(json.dumps(system)) + len(json.dumps(payload["messages"]))
+        return {"input_tokens": prompt_chars // 4, "output_tokens": max(1, len(text) // 4)}
+
+    def _json(self, handler, payload, text):
+        time.sleep(self.first_token_delay)
+        body = json.dumps({
+            "id": "msg_fake", "type": "message", "role": "assistant", "model": payload.get("model"),
+            "content": [{"type": "text", "text": text}], "stop_reason": "end_turn",
+            "usage": self._usage(payload, text),
+        }).encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _stream(self, handler, payload, text, failure):
+        usage = self._usage(payload, text)
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.end_headers()
+
+        def send(event, data):
+            handler.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        send("message_start", {"type": "message_start", "message": {
+            "id": "msg_fake", "type": "message", "role": "assistant", "model": payload.get("model"),
+            "content": [], "usage": {"input_tokens": usage["input_tokens"], "output_tokens": 1}}})
+        send("content_block_start", {"type": "content_block_start", "index": 0,
+                                     "content_block": {"type": "text", "text": ""}})
+        send("ping", {"type": "ping"})
+        time.sleep(self.first_token_delay)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            if failure and failure.get("stream_error") and i == len(words) // 2:
+                send("error", {"type": "error", "error": {"type": failure["stream_error"], "message": "fake"}})
+                return
+            if failure and failure.get("hang_up") and i == len(words) // 2:
+                return  # HTTP/1.0 response: returning closes the connection mid-stream
+            chunk = word if i == 0 else " " + word
+            send("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                         "delta": {"type": "text_delta", "text": chunk}})
+            if self.token_delay:
+                time.sleep(self.token_delay)
+        send("content_block_stop", {"type": "content_block_stop", "index": 0})
+        send("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                               "usage": {"output_tokens": usage["output_tokens"]}})
+        send("message_stop", {"type": "message_stop"})
+
+
+def _self_check():
+    import tempfile
+    import claude_client
+
+    fake = FakeClaude(token_delay=0.001, first_token_delay=0.05).start()
+    claude_client.CLAUDE_API_URL = fake.url
+    claude_client.RETRY_BASE_SECONDS = 0.05
+    out_dir = tempfile.mkdtemp()
+    try:
+        print("Plain JSON call:")
+        print("  ->", claude_client.call_claude("sys", "hello", "fake-key", stream=False))
+
+        print("Streaming call after a 529 (retry-after 0.2s) and a mid-stream overload:")
+        fake.failures = [{"status": 529, "retry_after": 0.2}, {"stream_error": "overloaded_error"}]
+        path = os.path.join(out_dir, "stream.txt")
+        text = claude_client.call_claude("sys", "hello " * 200, "fake-key", stream=True, stream_path=path)
+        with open(path, "r", encoding="utf-8") as f:
+            assert f.read() == text, "streamed file should match the returned text"
+        metrics = claude_client.call_log[-1]
+        assert metrics["attempts"] == 3, metrics
+        assert metrics["ttft"] is not None and metrics["ttft"] <= metrics["latency"], metrics
+        print("  ->", text)
+        print("  metrics:", metrics)
+
+        print("Streaming call whose first attempt hangs up before message_stop:")
+        fake.failures = [{"hang_up": True}]
+        text = claude_client.call_claude("sys", "hello " * 200, "fake-key", stream=True, stream_path=path)
+        metrics = claude_client.call_log[-1]
+        assert metrics["attempts"] == 2, metrics
+        assert text == echo_responder(fake.requests[-1]), "a truncated stream must not be returned"
+        print("  ->", text)
+
+        print("429 asking for a retry in an hour:")
+        fake.failures = [{"status": 429, "retry_after": 3600}]
+        try:
+            claude_client.call_claude("sys", "hello", "fake-key")
+            raise AssertionError("a retry-after over RETRY_MAX_SECONDS should fail the call")
+        except RuntimeError as e:
+            assert claude_client.call_log[-1]["attempts"] == 1, claude_client.call_log[-1]
+            print("  -> raised:", e)
+
+        print("Non-retryable 400:")
+        fake.failures = [{"status": 400}]
+        try:
+            claude_client.call_claude("sys", "hello", "fake-key")
+        except RuntimeError as e:
+            print("  -> raised:", e)
+        print("OK")
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    _self_check()
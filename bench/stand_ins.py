@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Local HTTP stand-ins for every source type fetch_sources reads.
+
+One server answers:
+  /r/<sub>/hot.json                 Reddit listing JSON
+  /hn/topstories.json, /hn/item/<id>.json   Hacker News Firebase API
+  /rss/<name>.xml, /atom/<name>.xml RSS 2.0 and Atom feeds
+  /trending[/<lang>]                GitHub trending HTML (bench/fixtures page)
+  /page/<name>                      a plain article page
+
+Responses come from a recorded file when one exists (recorded_dir/<path>,
+e.g. recorded/r/puzzles/hot.json) and are otherwise synthesised from a
+seeded word list, so runs are repeatable. Every request waits `latency`
+seconds (plus up to `jitter`) and fails with a 503 at `failure_rate`.
+
+Usage: python bench/stand_ins.py   — serves until interrupted and prints the URLs
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TRENDING_FIXTURE = os.path.join(BENCH_DIR, "fixtures", "github_trending_weekly.html")
+
+WORDS = """puzzle cipher escape room riddle maze clue lock code key hunt mystery crossword
+logic grid sudoku anagram vault signal pattern hidden message decoder solver trail
+map token enigma labyrinth archive relic compass lantern ledger chamber mechanism""".split()
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients dropping idle keep-alive connections is expected, not worth a traceback
+
+
+class SourceStandIns:
+    """Threaded local server for synthetic or recorded source responses."""
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, items_per_feed=15,
+                 recorded_dir=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.items_per_feed = items_per_feed
+        self.recorded_dir = recorded_dir
+        self.seed = seed
+        self.requests = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.server = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def env(self):
+        """fetch_sources endpoint overrides pointing at this server."""
+        return {
+            "REDDIT_BASE_URL": self.base_url,
+            "HN_API_URL": f"{self.base_url}/hn",
+            "GITHUB_TRENDING_URL": f"{self.base_url}/trending",
+            "PRODUCTHUNT_FEED_URL": f"{self.base_url}/rss/producthunt.xml",
+        }
+
+    def start(self):
+        stand_ins = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_ins._handle(self)
+
+        self.server = _QuietServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    # --- Request handling ---
+
+    def _handle(self, handler):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.random() * self.jitter
+            fail = self._rng.random() < self.failure_rate
+        if delay:
+            time.sleep(delay)
+        path = handler.path.split("?", 1)[0]
+        if fail:
+            with self._lock:
+                self.failures += 1
+            return self._send(handler, 503, "text/plain", b"stand-in failure")
+        body, content_type = self._recorded(path) or self._synthetic(path)
+        if body is None:
+            return self._send(handler, 404, "text/plain", b"not found")
+        self._send(handler, 200, content_type, body)
+
+    def _send(self, handler, status, content_type, body):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+        with self._lock:
+            self.bytes_sent += len(body)
+
+    def _recorded(self, path):
+        if not self.recorded_dir:
+            return None
+        file_path = os.path.normpath(os.path.join(self.recorded_dir, path.lstrip("/")))
+        if not file_path.startswith(os.path.normpath(self.recorded_dir)) or not os.path.isfile(file_path):
+            return None
+        content_type = "application/json" if file_path.endswith(".json") else (
+            "application/xml" if file_path.endswith(".xml") else "text/html")
+        with open(file_path, "rb") as f:
+            return f.read(), content_type
+
+    def _synthetic(self, path):
+        rng = random.Random(f"{self.seed}:{path}")  # same path, same content
+        if m := re.fullmatch(r"/r/([^/]+)/hot\.json", path):
+            return json.dumps(self._reddit(rng, m.group(1))).encode(), "application/json"
+        if path == "/hn/topstories.json":
+            return json.dumps(list(range(1000, 1000 + 5 * self.items_per_feed))).encode(), "application/json"
+        if m := re.fullmatch(r"/hn/item/(\d+)\.json", path):
+            return json.dumps({"id": int(m.group(1)), "type": "story", "title": _title(rng),
+                               "url": f"https://example.com/hn/{m.group(1)}"}).encode(), "application/json"
+        if m := re.fullmatch(r"/rss/([^/]+)\.xml", path):
+            return self._rss(rng, m.group(1)).encode(), "application/rss+xml"
+        if m := re.fullmatch(r"/atom/([^/]+)\.xml", path):
+            return self._atom(rng, m.group(1)).encode(), "application/atom+xml"
+        if path == "/trending" or path.startswith("/trending/"):
+            with open(TRENDING_FIXTURE, "rb") as f:
+                return f.read(), "text/html"
+        if m := re.fullmatch(r"/page/([^/]+)", path):
+            paragraphs = "".join(f"<p>{escape(_sentence(rng, 30))}</p>" for _ in range(8))
+            return (f"<html><head><title>{escape(_title(rng))}</title></head>"
+                    f"<body><nav>menu</nav><article>{paragraphs}</article></body></html>").encode(), "text/html"
+        return None, None
+
+    def _reddit(self, rng, subreddit):
+        children = []
+        for i in range(self.items_per_feed):
+            is_self = rng.random() < 0.6
+            children.append({"kind": "t3", "data": {
+                "title": _title(rng), "permalink": f"/r/{subreddit}/comments/{i}/post_{i}/",
+                "selftext": _sentence(rng, 40) if is_self else "", "is_self": is_self,
+                "url": f"https://example.com/{subreddit}/{i}" if not is_self else "",
+            }})
+        return {"kind": "Listing", "data": {"children": children}}
+
+    def _rss(self, rng, name):
+        now = datetime.now(timezone.utc)
+        items = "".join(
+            f"<item><title>{escape(_title(rng))}</title><link>https://example.com/{name}/{i}</link>"
+            f"<description>{escape(_sentence(rng, 35))}</description>"
+            f"<pubDate>{(now - timedelta(hours=i)).strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate></item>"
+            for i in range(self.items_per_feed))
+        return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f"<title>{name}</title><link>https://example.com/{name}</link>{items}</channel></rss>")
+
+    def _atom(self, rng, name):
+        entries = "".join(
+            f'<entry><title>{escape(_title(rng))}</title><link href="https://example.com/{name}/{i}"/>'
+            f"<summary>{escape(_sentence(rng, 35))}</summary></entry>"
+            for i in range(self.items_per_feed))
+        return f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{name}</title>{entries}</feed>'
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9))).title()
+
+
+def bench_sources(base_url, reddit=4, rss=3, atom=1, pages=1, hackernews=True, trending=True):
+    """A sources.json "sources" list covering every source type, all pointed at the stand-ins."""
+    sources = [{"type": "reddit", "subreddit": f"bench{i}", "name": f"r/bench{i}", "enabled": True, "limit": 10}
+               for i in range(reddit)]
+    sources += [{"type": "rss", "url": f"{base_url}/rss/feed{i}.xml", "name": f"Feed {i}", "enabled": True}
+                for i in range(rss)]
+    sources += [{"type": "rss", "url": f"{base_url}/atom/atom{i}.xml", "name": f"Atom {i}", "enabled": True}
+                for i in range(atom)]
+    sources += [{"type": "webpage", "url": f"{base_url}/page/article{i}", "name": f"Page {i}", "enabled": True}
+                for i in range(pages)]
+    if hackernews:
+        sources.append({"type": "hackernews", "name": "Hacker News", "enabled": True, "limit": 10})
+    if trending:
+        sources.append({"type": "github_trending", "name": "GitHub Trending", "enabled": True, "since": "weekly"})
+    return sources
+
+
+if __name__ == "__main__":
+    stand_ins = SourceStandIns().start()
+    print(f"Serving stand-ins at {stand_ins.base_url}")
+    for key, value in stand_ins.env().items():
+        print(f"  {key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stand_ins.stop()
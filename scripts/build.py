@@ -1,13 +1,56 @@
 #!/usr/bin/env python3
 """Static site generator: markdown to HTML with YAML frontmatter."""
 
+import filecmp
+import hashlib
+import itertools
 import json
 import os
 import re
 import html
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import format_datetime
 from pathlib import Path
 
+from tracing import span
+
+
+def write_if_changed(path, text, repo_root, changed=None):
+    """Write text to path unless the file already holds exactly that.
+
+    Written paths are added to `changed` (relative to repo_root, with forward
+    slashes), so callers can stage just what a build touched. Returns True if written.
+    """
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    with open(path, "wb") as f:
+        f.write(data)
+    if changed is not None:
+        changed.append(os.path.relpath(path, repo_root).replace(os.sep, "/"))
+    return True
+
+
+def write_chunks_if_changed(path, chunks, repo_root, changed=None):
+    """write_if_changed for text produced piecewise, so the whole of it is never in memory.
+
+    The chunks are streamed to a temp file, which replaces path only if the
+    two differ. Returns True if written.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk.encode("utf-8"))
+    if os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False):
+        os.remove(tmp)
+        return False
+    os.replace(tmp, path)
+    if changed is not None:
+        changed.append(os.path.relpath(path, repo_root).replace(os.sep, "/"))
+    return True
+
 
 def load_config(repo_root):
     """Load persona config."""
@@ -195,36 +238,109 @@ def markdown_to_html(md):
     return "\n".join(html_lines)
 
 
-def load_posts(repo_root):
-    """Load all posts from content/posts/."""
+class PostMeta:
+    """The fields listings, feeds and the sitemap need; a post's body is never kept."""
+
+    __slots__ = ("filename", "slug", "title", "date", "category", "excerpt", "tags", "digest")
+
+    def __init__(self, filename, meta, digest=""):
+        self.filename = filename
+        self.digest = digest  # hash of the markdown source, for sitemap lastmod
+        self.slug = filename.replace(".md", "")
+        self.title = meta.get("title", "Untitled")
+        self.date = meta.get("date", "")
+        self.category = meta.get("category", "")
+        self.excerpt = meta.get("excerpt", "")
+        self.tags = meta.get("tags", "")
+
+    # Dict-style access, so code written against the old per-post dicts works on these too
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Rendered posts per posts directory: {fname: (signature, PostMeta or None)}.
+# A long-running process (generate.py daemon) re-renders only posts whose
+# file or rendering inputs changed since its previous build.
+_post_cache = {}
+
+
+def _render_signature(template, config):
+    """Changes whenever the same post would render to a different page."""
+    inputs = json.dumps([template, config, datetime.now().year], sort_keys=True, default=str)
+    return hashlib.sha1(inputs.encode("utf-8")).hexdigest()
+
+
+def fragment_path(repo_root, slug):
+    """Cached rendered body of a post, reused by the feeds instead of rendering it again."""
+    return os.path.join(repo_root, ".cache", "fragments", f"{slug}.html")
+
+
+def _build_post_page(fname, fpath, repo_root, config, template, changed):
+    """Parse, render and write one post page and its body fragment. Returns its PostMeta, or None when it has no title."""
+    with open(fpath, "r", encoding="utf-8") as f:
+        text = f.read()
+    meta, body = parse_frontmatter(text)
+    if not meta.get("title"):
+        return None
+    post = PostMeta(fname, meta, hashlib.sha1(text.encode("utf-8")).hexdigest()[:16])
+    with span("render_post", cat="build", slug=post.slug):
+        body_html = markdown_to_html(body)
+        write_if_changed(fragment_path(repo_root, post.slug), body_html, repo_root)
+        post_content = f"""<article>
+    <div class="post-header">
+        <h1>{post.title}</h1>
+        <div class="post-meta">{post.date} &middot; {post.category}</div>
+    </div>
+    <div class="post-content">
+        {body_html}
+    </div>
+</article>"""
+        page = render_page(template, config, post.title, post_content, post.excerpt)
+        write_if_changed(os.path.join(repo_root, "posts", f"{post.slug}.html"), page, repo_root, changed)
+    return post
+
+
+def build_post_pages(repo_root, config, template, changed=None):
+    """Build every post page, one post at a time. Returns (PostMeta list newest first, pages rendered).
+
+    Only one post's body is in memory at any point, so memory use does not
+    grow with the size of the archive, only (slightly) with its post count.
+    """
     posts_dir = os.path.join(repo_root, "content", "posts")
+    if not os.path.isdir(posts_dir):
+        return [], 0
+    render_signature = _render_signature(template, config)
+    os.makedirs(os.path.dirname(fragment_path(repo_root, "")), exist_ok=True)
+    cached = _post_cache.get(posts_dir, {})
+    current = {}
     posts = []
-    if not os.path.exists(posts_dir):
-        return posts
-    for fname in os.listdir(posts_dir):
-        if not fname.endswith(".md"):
-            continue
-        fpath = os.path.join(posts_dir, fname)
-        with open(fpath, "r", encoding="utf-8") as f:
-            text = f.read()
-        meta, body = parse_frontmatter(text)
-        if not meta.get("title"):
-            continue
-        post = {
-            "filename": fname,
-            "slug": fname.replace(".md", ""),
-            "title": meta.get("title", "Untitled"),
-            "date": meta.get("date", ""),
-            "category": meta.get("category", ""),
-            "excerpt": meta.get("excerpt", ""),
-            "tags": meta.get("tags", ""),
-            "body_md": body,
-            "body_html": markdown_to_html(body),
-        }
-        posts.append(post)
+    rendered = 0
+    with os.scandir(posts_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".md"):
+                continue
+            st = entry.stat()
+            signature = (st.st_mtime_ns, st.st_size, render_signature)
+            hit = cached.get(entry.name)
+            page_path = os.path.join(repo_root, "posts", entry.name.replace(".md", "") + ".html")
+            if hit and hit[0] == signature and (hit[1] is None or os.path.exists(page_path)):
+                post = hit[1]
+            else:
+                post = _build_post_page(entry.name, entry.path, repo_root, config, template, changed)
+                rendered += 1
+            current[entry.name] = (signature, post)
+            if post is not None:
+                posts.append(post)
+    _post_cache[posts_dir] = current
     # Sort by date descending
-    posts.sort(key=lambda p: p["date"], reverse=True)
-    return posts
+    posts.sort(key=lambda p: p.date, reverse=True)
+    return posts, rendered
 
 
 def render_page(template, config, page_title, content, meta_description=""):
@@ -279,87 +395,276 @@ def render_page(template, config, page_title, content, meta_description=""):
     return page
 
 
-def build_post_list_html(posts, base_url):
-    """Build HTML for a list of posts."""
+_CONTENT_MARK = "\0content\0"
+
+
+def render_page_chunks(template, config, page_title, chunks, meta_description=""):
+    """render_page for content given as chunks: yields the page head, the chunks, then the tail."""
+    head, tail = render_page(template, config, page_title, _CONTENT_MARK, meta_description).split(_CONTENT_MARK, 1)
+    yield head
+    yield from chunks
+    yield tail
+
+
+def iter_post_list_html(posts, base_url):
+    """build_post_list_html, one list item at a time."""
     if not posts:
-        return "<p>No posts yet. Check back soon!</p>"
-    items = []
-    for post in posts:
+        yield "<p>No posts yet. Check back soon!</p>"
+        return
+    yield '<ul class="post-list">\n'
+    for i, post in enumerate(posts):
         cat_html = ""
         if post["category"]:
             cat_slug = post["category"].lower().replace(" ", "-")
             cat_html = f'<span class="post-category"><a href="{base_url}/category/{cat_slug}.html">{post["category"]}</a></span>'
-        items.append(f"""<li class="post-item">
+        separator = "\n" if i else ""
+        yield f"""{separator}<li class="post-item">
     <div class="post-date">{post["date"]}{cat_html}</div>
     <h2 class="post-title"><a href="{base_url}/posts/{post["slug"]}.html">{post["title"]}</a></h2>
     <p class="post-excerpt">{post["excerpt"]}</p>
-</li>""")
-    return '<ul class="post-list">\n' + "\n".join(items) + "\n</ul>"
+</li>"""
+    yield "\n</ul>"
+
+
+def build_post_list_html(posts, base_url):
+    """Build HTML for a list of posts."""
+    return "".join(iter_post_list_html(posts, base_url))
 
 
-def generate_rss(posts, config, repo_root):
-    """Generate RSS feed (feed.xml)."""
+FEED_ITEMS = 20  # default number of posts in feed.xml and atom.xml; persona "feed_items" overrides
+
+
+def _feed_datetime(date):
+    """A post's YYYY-MM-DD date as a UTC datetime, or None if it doesn't parse."""
+    try:
+        return datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _cdata(text):
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def post_fragment(repo_root, post):
+    """A post's rendered body HTML, from the fragment cache (re-rendered only if missing)."""
+    path = fragment_path(repo_root, post.slug)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        with open(os.path.join(repo_root, "content", "posts", post.filename), "r", encoding="utf-8") as f:
+            _, body = parse_frontmatter(f.read())
+        body_html = markdown_to_html(body)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_if_changed(path, body_html, repo_root)
+        return body_html
+
+
+def _feed_posts(posts, config):
+    return posts[:int(config.get("feed_items", FEED_ITEMS))]
+
+
+def generate_rss(posts, config, repo_root, changed=None):
+    """Generate the RSS 2.0 feed (feed.xml) with full post bodies in content:encoded."""
     base_url = config.get("base_url", "")
     site_name = config.get("site_name", "Blog")
     tagline = config.get("tagline", "")
+    feed_posts = _feed_posts(posts, config)
+    # Dated by the newest post, so an unchanged archive builds a byte-identical feed
+    newest = _feed_datetime(max((p["date"] for p in posts), default=""))
+    last_build = f"\n    <lastBuildDate>{format_datetime(newest)}</lastBuildDate>" if newest else ""
     items = []
-    for post in posts[:20]:
-        pub_date = post["date"]
+    for post in feed_posts:
+        link = f"{base_url}/posts/{post.slug}.html"
+        published = _feed_datetime(post.date)
+        pub_date = f"\n      <pubDate>{format_datetime(published)}</pubDate>" if published else ""
         items.append(f"""    <item>
-      <title>{html.escape(post["title"])}</title>
-      <link>{base_url}/posts/{post["slug"]}.html</link>
-      <guid>{base_url}/posts/{post["slug"]}.html</guid>
-      <pubDate>{pub_date}</pubDate>
-      <category>{html.escape(post.get("category", ""))}</category>
-      <description>{html.escape(post["excerpt"])}</description>
+      <title>{html.escape(post.title)}</title>
+      <link>{link}</link>
+      <guid isPermaLink="true">{link}</guid>{pub_date}
+      <category>{html.escape(post.category)}</category>
+      <description>{html.escape(post.excerpt)}</description>
+      <content:encoded>{_cdata(post_fragment(repo_root, post))}</content:encoded>
     </item>""")
     feed = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:content="http://purl.org/rss/1.0/modules/content/">
   <channel>
     <title>{html.escape(site_name)}</title>
     <link>{base_url}</link>
     <description>{html.escape(tagline)}</description>
     <atom:link href="{base_url}/feed.xml" rel="self" type="application/rss+xml"/>
-    <language>en-us</language>
-    <lastBuildDate>{datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>
+    <language>en-us</language>{last_build}
 {chr(10).join(items)}
   </channel>
 </rss>"""
-    out_path = os.path.join(repo_root, "feed.xml")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(feed)
-    print(f"  Built feed.xml ({len(posts[:20])} items)")
+    write_if_changed(os.path.join(repo_root, "feed.xml"), feed, repo_root, changed)
+    print(f"  Built feed.xml ({len(feed_posts)} items)")
 
 
-def generate_sitemap(posts, config, repo_root):
-    """Generate sitemap.xml."""
+def generate_atom(posts, config, repo_root, changed=None):
+    """Generate the Atom feed (atom.xml) with full post bodies."""
     base_url = config.get("base_url", "")
-    urls = [f"  <url><loc>{base_url}/</loc></url>",
-            f"  <url><loc>{base_url}/about.html</loc></url>"]
-    for post in posts:
-        urls.append(f"  <url><loc>{base_url}/posts/{post['slug']}.html</loc></url>")
+    site_name = config.get("site_name", "Blog")
+    feed_posts = _feed_posts(posts, config)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    updated = _feed_datetime(max((p["date"] for p in posts), default="")) or epoch
+    entries = []
+    for post in feed_posts:
+        link = f"{base_url}/posts/{post.slug}.html"
+        published = (_feed_datetime(post.date) or epoch).isoformat().replace("+00:00", "Z")
+        category = f'\n    <category term="{html.escape(post.category)}"/>' if post.category else ""
+        entries.append(f"""  <entry>
+    <title>{html.escape(post.title)}</title>
+    <link rel="alternate" type="text/html" href="{link}"/>
+    <id>{link}</id>
+    <published>{published}</published>
+    <updated>{published}</updated>{category}
+    <summary>{html.escape(post.excerpt)}</summary>
+    <content type="html">{html.escape(post_fragment(repo_root, post))}</content>
+  </entry>""")
+    feed = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{html.escape(site_name)}</title>
+  <subtitle>{html.escape(config.get("tagline", ""))}</subtitle>
+  <link rel="self" type="application/atom+xml" href="{base_url}/atom.xml"/>
+  <link rel="alternate" type="text/html" href="{base_url}/"/>
+  <id>{base_url}/</id>
+  <updated>{updated.isoformat().replace("+00:00", "Z")}</updated>
+  <author><name>{html.escape(config.get("author_name", site_name))}</name></author>
+{chr(10).join(entries)}
+</feed>"""
+    write_if_changed(os.path.join(repo_root, "atom.xml"), feed, repo_root, changed)
+    print(f"  Built atom.xml ({len(feed_posts)} entries)")
+
+
+# Shards sit at the site root next to sitemap.xml: a sitemap may only list URLs
+# under its own directory. The manifest is build state, kept out of the web root.
+SITEMAP_MANIFEST = os.path.join("config", "sitemap_manifest.json")
+SITEMAP_SHARD_URLS = 5000  # well under the protocol's 50,000, so an edit rewrites one small file
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def _load_sitemap_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"urls": {}, "shards": {}}
+    return {"urls": manifest.get("urls", {}), "shards": manifest.get("shards", {})}
+
+
+def _sitemap_shard(entries):
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'
+    for loc, lastmod in entries:
+        lastmod_tag = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+        yield f"  <url><loc>{loc}</loc>{lastmod_tag}</url>\n"
+    yield "</urlset>\n"
+
+
+def generate_sitemap(posts, config, repo_root, changed=None):
+    """Generate sharded sitemap-*.xml files, listed by sitemap_index.xml.
+
+    A post's lastmod is its date until its markdown changes, then the day the
+    change was built; config/sitemap_manifest.json remembers each post's content
+    hash and lastmod between builds. Posts are sharded oldest first, so a new
+    post only touches the last shard, and a shard is rewritten only when one
+    of its URLs or lastmods changed. sitemap.xml holds a copy of the index
+    for crawlers that were given the old flat sitemap.
+    """
+    base_url = config.get("base_url", "")
+    manifest_path = os.path.join(repo_root, SITEMAP_MANIFEST)
+    previous = _load_sitemap_manifest(manifest_path)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    manifest = {"urls": {}, "shards": {}}
+    post_entries = []
+    category_lastmod = {}
+    for post in sorted(posts, key=lambda p: (p.date, p.slug)):
+        loc = f"{base_url}/posts/{post.slug}.html"
+        known = previous["urls"].get(loc)
+        if known and known[0] == post.digest:
+            lastmod = known[1]
+        elif known or not _feed_datetime(post.date):
+            lastmod = today
+        else:
+            lastmod = post.date
+        manifest["urls"][loc] = [post.digest, lastmod]
+        post_entries.append((loc, lastmod))
+        if post.category:
+            category_lastmod[post.category] = max(category_lastmod.get(post.category, ""), lastmod)
+
+    newest = max((lastmod for _, lastmod in post_entries), default=None)
+    page_entries = [(f"{base_url}/", newest), (f"{base_url}/about.html", None)]
     for cat in config.get("categories", []):
         slug = cat.lower().replace(" ", "-")
-        urls.append(f"  <url><loc>{base_url}/category/{slug}.html</loc></url>")
-    sitemap = f"""<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-{chr(10).join(urls)}
-</urlset>"""
-    out_path = os.path.join(repo_root, "sitemap.xml")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(sitemap)
-    print(f"  Built sitemap.xml ({len(urls)} URLs)")
+        page_entries.append((f"{base_url}/category/{slug}.html", category_lastmod.get(cat)))
+    shards = [("sitemap-pages.xml", page_entries)]
+    for start in range(0, len(post_entries), SITEMAP_SHARD_URLS):
+        shards.append((f"sitemap-posts-{start // SITEMAP_SHARD_URLS + 1:04d}.xml",
+                       post_entries[start:start + SITEMAP_SHARD_URLS]))
+
+    rewritten = 0
+    index_entries = []
+    for name, entries in shards:
+        path = os.path.join(repo_root, name)
+        fingerprint = hashlib.sha1(repr(entries).encode("utf-8")).hexdigest()
+        manifest["shards"][name] = fingerprint
+        if previous["shards"].get(name) != fingerprint or not os.path.exists(path):
+            rewritten += write_chunks_if_changed(path, _sitemap_shard(entries), repo_root, changed)
+        index_entries.append((f"{base_url}/{name}",
+                              max((lastmod for _, lastmod in entries if lastmod), default=None)))
+    for name in previous["shards"].keys() - manifest["shards"].keys():
+        stale = os.path.join(repo_root, name)
+        if os.path.exists(stale):
+            os.remove(stale)
+            if changed is not None:
+                changed.append(name)
+
+    index_lines = []
+    for loc, lastmod in index_entries:
+        lastmod_tag = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+        index_lines.append(f"  <sitemap><loc>{loc}</loc>{lastmod_tag}</sitemap>")
+    index = (f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n'
+             + "\n".join(index_lines) + "\n</sitemapindex>\n")
+    write_if_changed(os.path.join(repo_root, "sitemap_index.xml"), index, repo_root, changed)
+    write_if_changed(os.path.join(repo_root, "sitemap.xml"), index, repo_root, changed)
+    write_if_changed(manifest_path, json.dumps(manifest, indent=1, sort_keys=True), repo_root, changed)
+    url_count = len(page_entries) + len(post_entries)
+    print(f"  Built sitemap_index.xml ({len(shards)} shards, {rewritten} rewritten, {url_count} URLs)")
 
 
 def build_site(repo_root=None):
-    """Build the entire static site."""
+    """Build the entire static site. Returns the repo-relative paths whose content changed."""
     if repo_root is None:
         repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
     print(f"Building site from: {repo_root}")
     config = load_config(repo_root)
     template = load_template(repo_root)
-    posts = load_posts(repo_root)
+    changed = build_pages(repo_root, config, template)
+
+    # Build about page
+    changed += build_about_page(repo_root, config, template)
+
+    print(f"Build complete! ({len(changed)} files changed)")
+    return changed
+
+
+def build_pages(repo_root, config=None, template=None):
+    """Build post pages, listings, RSS and sitemap: everything except the about page.
+
+    None of these read soul.json, so they can be built while reflection runs.
+    Post pages are streamed (see build_post_pages) and the later stages work
+    from compact PostMeta records, writing listings piece by piece, so peak
+    memory stays flat as the archive grows.
+    Returns the repo-relative paths whose content changed.
+    """
+    changed = []
+    if config is None:
+        config = load_config(repo_root)
+    if template is None:
+        template = load_template(repo_root)
     base_url = config.get("base_url", "")
 
     # Ensure output dirs
@@ -367,27 +672,15 @@ def build_site(repo_root=None):
     os.makedirs(os.path.join(repo_root, "category"), exist_ok=True)
 
     # Build individual post pages
-    for post in posts:
-        post_content = f"""<article>
-    <div class="post-header">
-        <h1>{post["title"]}</h1>
-        <div class="post-meta">{post["date"]} &middot; {post["category"]}</div>
-    </div>
-    <div class="post-content">
-        {post["body_html"]}
-    </div>
-</article>"""
-        page = render_page(template, config, post["title"], post_content, post.get("excerpt", ""))
-        out_path = os.path.join(repo_root, "posts", f"{post['slug']}.html")
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(page)
-    print(f"  Built {len(posts)} post pages")
+    with span("post_pages", cat="build") as details:
+        posts, rendered = build_post_pages(repo_root, config, template, changed)
+        details.update(posts=len(posts), rendered=rendered)
+    print(f"  Built {len(posts)} post pages ({rendered} rendered)")
 
     # Build homepage
-    homepage_content = build_post_list_html(posts, base_url)
-    homepage = render_page(template, config, "Home", homepage_content)
-    with open(os.path.join(repo_root, "index.html"), "w", encoding="utf-8") as f:
-        f.write(homepage)
+    with span("render_index", cat="build"):
+        homepage = render_page_chunks(template, config, "Home", iter_post_list_html(posts, base_url))
+        write_chunks_if_changed(os.path.join(repo_root, "index.html"), homepage, repo_root, changed)
     print("  Built index.html")
 
     # Build category pages
@@ -397,32 +690,34 @@ def build_site(repo_root=None):
         if cat:
             categories.setdefault(cat, []).append(post)
     for cat_name, cat_posts in categories.items():
-        slug = cat_name.lower().replace(" ", "-")
-        cat_content = f'<h1 class="category-title">{cat_name}</h1>\n' + build_post_list_html(cat_posts, base_url)
-        page = render_page(template, config, cat_name, cat_content)
-        out_path = os.path.join(repo_root, "category", f"{slug}.html")
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(page)
+        with span("render_category", cat="build", category=cat_name):
+            slug = cat_name.lower().replace(" ", "-")
+            cat_content = itertools.chain([f'<h1 class="category-title">{cat_name}</h1>\n'],
+                                          iter_post_list_html(cat_posts, base_url))
+            page = render_page_chunks(template, config, cat_name, cat_content)
+            write_chunks_if_changed(os.path.join(repo_root, "category", f"{slug}.html"), page, repo_root, changed)
     print(f"  Built {len(categories)} category pages")
 
-    # Build about page
-    build_about_page(repo_root, config, template)
-
     # Build RSS and sitemap
-    generate_rss(posts, config, repo_root)
-    generate_sitemap(posts, config, repo_root)
+    with span("feeds", cat="build"):
+        generate_rss(posts, config, repo_root, changed)
+        generate_atom(posts, config, repo_root, changed)
+    with span("sitemap", cat="build"):
+        generate_sitemap(posts, config, repo_root, changed)
 
     # Ensure .nojekyll
     nojekyll = os.path.join(repo_root, ".nojekyll")
     if not os.path.exists(nojekyll):
-        with open(nojekyll, "w") as f:
-            pass
+        write_if_changed(nojekyll, "", repo_root, changed)
+    return changed
 
-    print("Build complete!")
 
+def _generate_interest_wordcloud(interests, repo_root, config, changed=None):
+    """Generate a word cloud PNG from interest phrases. Returns relative path or None.
 
-def _generate_interest_wordcloud(interests, repo_root, config):
-    """Generate a word cloud PNG from interest phrases. Returns relative path or None."""
+    Layout and colours are seeded from the interests, so the same interests
+    give the same image and the PNG only changes when they do.
+    """
     rel_path = "assets/img/interest-cloud.png"
     try:
         from wordcloud import WordCloud
@@ -454,11 +749,15 @@ def _generate_interest_wordcloud(interests, repo_root, config):
     bg_color = colors.get("bg_primary", "#0d1117")
     accent = colors.get("accent", "#c9a84c")
 
+    import io
+    import random
+    seed = int(hashlib.sha1("\n".join(interests).encode("utf-8")).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+
     # Generate color variants around the accent for visual variety
     def color_func(word, font_size, position, orientation, **kwargs):
-        import random
         palette = [accent, colors.get("text_primary", "#e6d5b8"), colors.get("accent_hover", "#b8962f")]
-        return random.choice(palette)
+        return rng.choice(palette)
 
     wc = WordCloud(
         width=800,
@@ -469,19 +768,23 @@ def _generate_interest_wordcloud(interests, repo_root, config):
         prefer_horizontal=0.85,
         relative_scaling=0.6,
         margin=10,
+        random_state=seed,
     )
     wc.generate_from_frequencies(word_counts)
 
     img_dir = os.path.join(repo_root, "assets", "img")
     os.makedirs(img_dir, exist_ok=True)
     img_path = os.path.join(img_dir, "interest-cloud.png")
-    wc.to_file(img_path)
-    print(f"  Generated word cloud: {img_path}")
+    png = io.BytesIO()
+    wc.to_image().save(png, format="PNG")
+    if write_if_changed(img_path, png.getvalue(), repo_root, changed):
+        print(f"  Generated word cloud: {img_path}")
     return rel_path
 
 
 def build_about_page(repo_root, config=None, template=None):
-    """Build/rebuild the about page from soul.json and persona.json."""
+    """Build/rebuild the about page from soul.json and persona.json. Returns the changed paths."""
+    changed = []
     if config is None:
         config = load_config(repo_root)
     if template is None:
@@ -514,7 +817,8 @@ def build_about_page(repo_root, config=None, template=None):
     interests = soul.get("current_interests", [])
     if interests:
         about_parts.append("<h2>What I'm Exploring Lately</h2>")
-        wc_path = _generate_interest_wordcloud(interests, repo_root, config)
+        with span("wordcloud", cat="build", interests=len(interests)):
+            wc_path = _generate_interest_wordcloud(interests, repo_root, config, changed)
         if wc_path:
             about_parts.append(f'<img src="{base_url}/{wc_path}" alt="Interest word cloud" class="interest-cloud">')
             about_parts.append('<style>.interest-cloud { max-width: 100%; border-radius: 8px; margin: 0.5rem 0 1.2rem; }</style>')
@@ -541,9 +845,9 @@ def build_about_page(repo_root, config=None, template=None):
     about_html = "\n".join(about_parts)
 
     page = render_page(template, config, "About", about_html, f"About {config.get('site_name', '')}")
-    with open(os.path.join(repo_root, "about.html"), "w", encoding="utf-8") as f:
-        f.write(page)
+    write_if_changed(os.path.join(repo_root, "about.html"), page, repo_root, changed)
     print("  Built about.html")
+    return changed
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Per-cycle run directories with step checkpoints, so a failed cycle can resume.
+
+Each run lives in .cache/runs/<run-id>/ under the repo root: a manifest.json
+listing completed steps, plus one <step>.json per step holding its output.
+A resumed run (generate.py --resume <run-id>) loads completed steps' outputs
+instead of running them again. The manifest also records the cycle's clock
+and token calibration, which a resume or a replay (--replay <run-id>) reuses.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from tracing import span
+
+
+def runs_dir(repo_root):
+    return os.path.join(repo_root, ".cache", "runs")
+
+
+class RunCheckpoint:
+    """Checkpoint store for one generation cycle."""
+
+    def __init__(self, repo_root, run_id=None):
+        self.resumed = run_id is not None
+        self._lock = threading.Lock()  # steps may finish concurrently
+        self.run_id = run_id or self._new_run_id(repo_root)
+        self.path = os.path.join(runs_dir(repo_root), self.run_id)
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if self.resumed:
+            if not os.path.exists(manifest_path):
+                raise FileNotFoundError(f"No run '{self.run_id}' to resume in {runs_dir(repo_root)}")
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        else:
+            os.makedirs(self.path, exist_ok=True)
+            self.manifest = {"run_id": self.run_id, "started": datetime.now().isoformat(timespec="seconds"),
+                             "steps": {}, "completed": False}
+            self._write_manifest()
+
+    @staticmethod
+    def _new_run_id(repo_root):
+        run_id = base = datetime.now().strftime("%Y%m%d-%H%M%S")
+        n = 1
+        while os.path.exists(os.path.join(runs_dir(repo_root), run_id)):
+            n += 1  # several runs in one second (benchmarks, daemon catch-up)
+            run_id = f"{base}-{n}"
+        return run_id
+
+    def _write_json(self, path, data):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _write_manifest(self):
+        self._write_json(os.path.join(self.path, "manifest.json"), self.manifest)
+
+    def record(self, **fields):
+        """Store run-wide inputs (cycle clock, token calibration) in the manifest."""
+        with self._lock:
+            self.manifest.update(fields)
+            self._write_manifest()
+
+    def add_paths(self, paths):
+        """Remember repo paths this run wrote, so a resumed run can still stage them."""
+        with self._lock:
+            known = set(self.manifest.get("changed_paths", []))
+            if not known.issuperset(paths):
+                self.manifest["changed_paths"] = sorted(known.union(paths))
+                self._write_manifest()
+
+    @property
+    def changed_paths(self):
+        return set(self.manifest.get("changed_paths", []))
+
+    def done(self, step):
+        return step in self.manifest["steps"]
+
+    def load(self, step):
+        with open(os.path.join(self.path, f"{step}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, step, value):
+        """Write a step's output, then mark it completed in the manifest."""
+        self._write_json(os.path.join(self.path, f"{step}.json"), value)
+        with self._lock:
+            self.manifest["steps"][step] = datetime.now().isoformat(timespec="seconds")
+            self._write_manifest()
+
+    def step(self, name, fn):
+        """Run fn() and checkpoint its output, or return the saved output if already done."""
+        if self.done(name):
+            print(f"\n=== {name}: completed earlier in run {self.run_id}, skipping ===")
+            with span(name, cat="step", skipped=True):
+                return self.load(name)
+        with span(name, cat="step"):
+            value = fn()
+            self.save(name, value)
+        return value
+
+    def finish(self):
+        with self._lock:
+            self.manifest["completed"] = True
+            self.manifest["finished"] = datetime.now().isoformat(timespec="seconds")
+            self._write_manifest()
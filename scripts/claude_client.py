@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""Claude client: Messages API over pooled keep-alive HTTPS (optionally streamed), or the claude CLI.
+
+System prompts may be plain strings or structured blocks (see system_blocks)
+whose stable prefix carries cache_control breakpoints for prompt caching.
+
+Responses can be cached on disk, keyed by a hash of (model, system, user,
+max_tokens, temperature): "readwrite" serves hits and records misses,
+"replay" serves hits and fails on misses (deterministic, offline runs; see
+generate.py --replay for pinning a cycle's inputs), and "off" always calls live.
+
+API calls retry transient failures (429, 529, 5xx, timeouts) with jittered
+exponential backoff that honours retry-after; a retry-after longer than
+RETRY_MAX_SECONDS fails the call instead (the run can be resumed later). In streaming mode the SSE
+response is written to disk as it arrives, and time-to-first-token and total
+latency are recorded for every call in `call_log`, and appended as JSON lines
+to CALL_LOG_PATH when a run sets it. Reported input token usage calibrates the
+shared prompt token estimator (tokens.py).
+
+Zero external dependencies — stdlib only.
+"""
+
+import hashlib
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+from urllib.error import HTTPError, URLError
+
+import http_pool
+from tokens import estimator
+from tracing import span
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# CLAUDE_API_URL can point at a local stand-in (see bench/fake_claude.py)
+CLAUDE_API_URL = os.environ.get("CLAUDE_API_URL", "https://api.anthropic.com/v1/messages")
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Streaming client mode: enabled with CLAUDE_STREAM=1 or generate.py --stream
+CLAUDE_STREAM = os.environ.get("CLAUDE_STREAM", "") == "1"
+
+# Content-addressed response cache: generate.py --llm-cache or LLM_CACHE=...
+LLM_CACHE_MODES = ("off", "readwrite", "replay")
+LLM_CACHE_MODE = os.environ.get("LLM_CACHE", "off")
+
+# Used when a caller gives no repo_root: this checkout
+DEFAULT_REPO_ROOT = os.path.dirname(SCRIPT_DIR)
+
+
+def stream_dir(repo_root=None):
+    return os.path.join(repo_root or DEFAULT_REPO_ROOT, ".cache", "claude-stream")
+
+
+def llm_cache_dir(repo_root=None):
+    return os.path.join(repo_root or DEFAULT_REPO_ROOT, ".cache", "llm")
+
+REQUEST_TIMEOUT = 120
+MAX_RETRIES = 4
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 60.0
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504, 529}
+
+# One metrics dict per call: label, attempts, ttft, latency, estimated and reported token usage
+call_log = []
+CALL_LOG_PATH = None  # per-run JSONL copy of call_log, set by generate.run_cycle
+_log_lock = threading.Lock()
+
+
+# The API allows at most this many cache_control breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+
+def system_blocks(stable, dynamic=""):
+    """Structured system prompt: cached stable blocks first, then the dynamic tail.
+
+    `stable` is a list of texts that must be byte-identical between calls to
+    hit the prompt cache; each gets a cache_control breakpoint. Order them
+    from most to least stable.
+    """
+    stable = [text for text in stable if text]
+    if len(stable) > MAX_CACHE_BREAKPOINTS:
+        stable = stable[:MAX_CACHE_BREAKPOINTS - 1] + ["\n\n".join(stable[MAX_CACHE_BREAKPOINTS - 1:])]
+    blocks = [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}} for text in stable]
+    if dynamic:
+        blocks.append({"type": "text", "text": dynamic})
+    return blocks
+
+
+def system_text(system_prompt):
+    """Flatten a system prompt (string or blocks) to plain text."""
+    if isinstance(system_prompt, str):
+        return system_prompt
+    return "\n\n".join(block.get("text", "") for block in system_prompt)
+
+
+class _RetryableError(Exception):
+    """A transient API failure; retry_after is the server's hint in seconds, if any."""
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, never shorter than the server's retry-after."""
+    delay = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _parse_retry_after(value):
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _open(payload, api_key):
+    """POST a Messages request, mapping transient failures to _RetryableError."""
+    headers = {
+        "Content-Type": "application/json",
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+    }
+    try:
+        return http_pool.urlopen(CLAUDE_API_URL, data=json.dumps(payload).encode("utf-8"), headers=headers,
+                                 timeout=REQUEST_TIMEOUT)
+    except HTTPError as e:
+        error_body = e.read().decode("utf-8", errors="replace")
+        print(f"  [claude] API error {e.code}: {error_body[:500]}")
+        if e.code in RETRYABLE_STATUS:
+            raise _RetryableError(f"HTTP {e.code}", _parse_retry_after(e.headers.get("retry-after")))
+        raise RuntimeError(f"Claude API returned {e.code}: {error_body[:200]}")
+    except (URLError, TimeoutError, OSError) as e:
+        raise _RetryableError(str(e))
+
+
+def _request_json(payload, api_key, metrics):
+    """Blocking request; returns the response text."""
+    try:
+        with _open(payload, api_key) as resp:
+            result = json.loads(resp.read().decode("utf-8"))
+    except (TimeoutError, OSError) as e:
+        raise _RetryableError(str(e))
+    metrics["usage"] = result.get("usage", {})
+    for block in result.get("content", []):
+        if block.get("type") == "text":
+            return block["text"]
+    return ""
+
+
+def _iter_sse(resp):
+    """Yield (event, data) pairs from a server-sent-events response."""
+    event, data_lines = None, []
+    for raw in resp:
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if not line:
+            if data_lines:
+                yield event, "\n".join(data_lines)
+            event, data_lines = None, []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+    if data_lines:
+        yield event, "\n".join(data_lines)
+
+
+def _request_stream(payload, api_key, metrics, stream_path, started):
+    """Streaming request; text deltas are appended to stream_path as they arrive.
+
+    metrics["ttft"] is measured from `started`, the start of this attempt. A
+    stream that ends before message_stop is retried, not returned as a reply.
+    """
+    parts = []
+    usage = {}
+    stopped = False
+    try:
+        with _open(dict(payload, stream=True), api_key) as resp, \
+                open(stream_path, "w", encoding="utf-8") as out:
+            for event, data in _iter_sse(resp):
+                try:
+                    message = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                kind = message.get("type", event)
+                if kind == "message_start":
+                    usage.update(message.get("message", {}).get("usage", {}))
+                elif kind == "content_block_delta":
+                    delta = message.get("delta", {})
+                    if delta.get("type") == "text_delta":
+                        if metrics.get("ttft") is None:
+                            metrics["ttft"] = round(time.monotonic() - started, 3)
+                        parts.append(delta.get("text", ""))
+                        out.write(delta.get("text", ""))
+                        out.flush()
+                elif kind == "message_delta":
+                    usage.update(message.get("usage", {}))
+                elif kind == "error":
+                    error = message.get("error", {})
+                    if error.get("type") in ("overloaded_error", "api_error", "rate_limit_error"):
+                        raise _RetryableError(f"stream error: {error.get('type')}")
+                    raise RuntimeError(f"Claude API stream error: {error}")
+                elif kind == "message_stop":
+                    stopped = True
+                    break
+    except (TimeoutError, OSError) as e:
+        raise _RetryableError(str(e))
+    if not stopped:
+        raise _RetryableError("stream ended early")
+    metrics["usage"] = usage
+    return "".join(parts)
+
+
+def _record(metrics):
+    with _log_lock:
+        call_log.append(metrics)
+        if CALL_LOG_PATH:
+            with open(CALL_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(metrics, ensure_ascii=False) + "\n")
+
+
+def _call_api(system_prompt, user_prompt, api_key, max_tokens, temperature, stream, stream_path, metrics,
+              repo_root=None):
+    payload = {
+        "model": CLAUDE_MODEL,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "system": system_prompt,
+        "messages": [{"role": "user", "content": user_prompt}],
+    }
+    if stream and stream_path is None:
+        spool = stream_dir(repo_root)
+        os.makedirs(spool, exist_ok=True)
+        stream_path = os.path.join(spool, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{len(call_log)}.txt")
+
+    started = time.monotonic()
+    metrics.update({"mode": "stream" if stream else "api", "model": CLAUDE_MODEL, "ttft": None, "attempts": 0})
+    for attempt in range(MAX_RETRIES + 1):
+        metrics["attempts"] = attempt + 1
+        try:
+            if stream:
+                text = _request_stream(payload, api_key, metrics, stream_path, time.monotonic())
+            else:
+                text = _request_json(payload, api_key, metrics)
+            break
+        except _RetryableError as e:
+            if attempt == MAX_RETRIES:
+                metrics["error"] = str(e)
+                raise RuntimeError(f"Claude API failed after {attempt + 1} attempts: {e}")
+            if e.retry_after is not None and e.retry_after > RETRY_MAX_SECONDS:
+                # Retrying sooner than the server asked would only be refused again
+                metrics["error"] = f"{e}, retry-after {e.retry_after:.0f}s"
+                raise RuntimeError(f"Claude API asked to retry after {e.retry_after:.0f}s "
+                                   f"(more than {RETRY_MAX_SECONDS:.0f}s): {e}")
+            delay = _retry_delay(attempt, e.retry_after)
+            print(f"  [claude] {e}; retrying in {delay:.1f}s (attempt {attempt + 2}/{MAX_RETRIES + 1})")
+            metrics["ttft"] = None
+            time.sleep(delay)
+
+    metrics["latency"] = round(time.monotonic() - started, 3)
+    usage = metrics.get("usage", {})
+    estimator.observe(metrics["prompt_chars"], usage.get("input_tokens", 0)
+                      + usage.get("cache_read_input_tokens", 0) + usage.get("cache_creation_input_tokens", 0))
+    ttft = f", ttft {metrics['ttft']:.1f}s" if metrics["ttft"] is not None else ""
+    cache = ""
+    if usage.get("cache_read_input_tokens") or usage.get("cache_creation_input_tokens"):
+        cache = (f" (cache read {usage.get('cache_read_input_tokens', 0)}, "
+                 f"write {usage.get('cache_creation_input_tokens', 0)})")
+    print(f"  [claude] {usage.get('input_tokens', '?')} in{cache} / {usage.get('output_tokens', '?')} out tokens"
+          f"{ttft}, total {metrics['latency']:.1f}s")
+    if stream:
+        metrics["stream_path"] = stream_path
+    return text
+
+
+def cache_key(system_prompt, user_prompt, max_tokens, temperature, model=None):
+    """sha256 over the request fields that determine the response."""
+    material = json.dumps([model or CLAUDE_MODEL, system_prompt, user_prompt, max_tokens, temperature],
+                          ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key, repo_root=None):
+    return os.path.join(llm_cache_dir(repo_root), key[:2], f"{key}.json")
+
+
+def _cache_read(key, repo_root=None):
+    path = _cache_path(key, repo_root)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("text")
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  [claude] Unreadable cache entry {path}: {e}")
+        return None
+
+
+def _cache_write(key, text, max_tokens, temperature, repo_root=None):
+    path = _cache_path(key, repo_root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "model": CLAUDE_MODEL, "max_tokens": max_tokens, "temperature": temperature,
+                   "created": datetime.now().isoformat(timespec="seconds"), "text": text},
+                  f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def call_claude(system_prompt, user_prompt, api_key, max_tokens=4096, temperature=0.8,
+                stream=None, stream_path=None, label=None, repo_root=None):
+    """Call Claude via API (if api_key provided) or CLI (claude -p) for local runs.
+
+    system_prompt is a string or a list of system blocks from system_blocks();
+    the CLI path flattens blocks to text. stream defaults to CLAUDE_STREAM;
+    stream_path is where streamed text is written (a timestamped file under
+    stream_dir(repo_root) if not given). The LLM_CACHE_MODE response cache in
+    llm_cache_dir(repo_root) is checked before any live call; repo_root is the
+    site the call is made for (this checkout if None). label names the
+    calling step in the metrics log.
+    """
+    if LLM_CACHE_MODE not in LLM_CACHE_MODES:
+        raise ValueError(f"Unknown LLM cache mode {LLM_CACHE_MODE!r}; expected one of {LLM_CACHE_MODES}")
+    prompt_chars = len(system_text(system_prompt)) + len(user_prompt)
+    metrics = {"label": label, "time": datetime.now().isoformat(timespec="seconds"),
+               "prompt_chars": prompt_chars, "estimated_input_tokens": estimator.estimate_chars(prompt_chars)}
+    with span("claude", cat="llm", label=label) as details:
+        try:
+            return _call_claude(system_prompt, user_prompt, api_key, max_tokens, temperature,
+                                stream, stream_path, metrics, repo_root)
+        finally:
+            usage = metrics.get("usage", {})
+            details.update(mode=metrics.get("mode"), attempts=metrics.get("attempts"),
+                           input_tokens=usage.get("input_tokens"), output_tokens=usage.get("output_tokens"))
+
+
+def _call_claude(system_prompt, user_prompt, api_key, max_tokens, temperature, stream, stream_path, metrics,
+                 repo_root):
+    try:
+        key = None
+        if LLM_CACHE_MODE != "off":
+            key = cache_key(system_prompt, user_prompt, max_tokens, temperature)
+            text = _cache_read(key, repo_root)
+            if text is not None:
+                print(f"  [claude] Response cache hit {key[:12]}")
+                metrics.update({"mode": "cache", "key": key, "attempts": 0, "latency": 0.0})
+                return text
+            if LLM_CACHE_MODE == "replay":
+                raise RuntimeError(f"No recorded response for request {key[:12]} (--llm-cache=replay)")
+
+        text = _call_live(system_prompt, user_prompt, api_key, max_tokens, temperature, stream, stream_path, metrics,
+                          repo_root)
+        if key is not None:
+            _cache_write(key, text, max_tokens, temperature, repo_root)
+        return text
+    except Exception as e:
+        metrics.setdefault("error", str(e))
+        raise
+    finally:
+        _record(metrics)
+
+
+def _call_live(system_prompt, user_prompt, api_key, max_tokens, temperature, stream, stream_path, metrics,
+               repo_root):
+    if api_key:
+        # --- API path (GitHub Actions) ---
+        return _call_api(system_prompt, user_prompt, api_key, max_tokens, temperature,
+                         CLAUDE_STREAM if stream is None else stream, stream_path, metrics, repo_root)
+    else:
+        # --- CLI path (local / Task Scheduler) ---
+        import shutil
+        claude_bin = shutil.which("claude") or os.path.expandvars(r"%APPDATA%\npm\claude.cmd")
+        print(f"  [claude] Using claude CLI: {claude_bin}")
+        cmd = [claude_bin, "-p", "--model", "sonnet", "--output-format", "text"]
+        # Combine system+user prompt and pipe via stdin to avoid Windows cmd length limit
+        system_prompt = system_text(system_prompt)
+        full_prompt = f"[System instructions]\n{system_prompt}\n\n[User request]\n{user_prompt}" if system_prompt else user_prompt
+        started = time.monotonic()
+        result = subprocess.run(cmd, input=full_prompt, capture_output=True, text=True, timeout=300, encoding="utf-8")
+        metrics.update({"mode": "cli", "attempts": 1, "latency": round(time.monotonic() - started, 3)})
+        if result.returncode != 0:
+            print(f"  [claude] CLI error: {result.stderr[:500]}")
+            raise RuntimeError(f"claude CLI failed (exit {result.returncode}): {result.stderr[:200]}")
+        return result.stdout.strip()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Cron-scheduled cycles in one long-running process, with a local status endpoint.
+
+    python scripts/generate.py daemon --schedule "0 9 * * 1" --status-port 8787
+
+A cold launch re-imports every module, reloads config and re-reads every
+post. The daemon keeps all of that between cycles (see generate.run_daemon
+for what it holds on to) and only sleeps in between. GET /status on
+127.0.0.1:<port> returns the schedule, the next run and the recent runs'
+timings as JSON.
+"""
+
+import json
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))  # minute hour day month weekday
+HISTORY_SIZE = 20
+WAKE_SECONDS = 60  # re-check the clock at least this often, so clock jumps and suspends don't oversleep
+
+
+def _parse_field(field, lo, hi):
+    """Set of values matched by one cron field: *, n, a-b, with /step, comma separated."""
+    values = set()
+    for part in field.split(","):
+        spec, _, step = part.partition("/")
+        if spec == "*":
+            start, end = lo, hi
+        elif "-" in spec:
+            start, end = (int(v) for v in spec.split("-", 1))
+        else:
+            start = int(spec)
+            end = hi if step else start
+        step = int(step) if step else 1
+        if not (lo <= start <= end <= hi) or step < 1:
+            raise ValueError(f"Cron field {field!r} is outside {lo}-{hi}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A five-field cron expression (minute hour day-of-month month day-of-week), in local time."""
+
+    def __init__(self, expr):
+        fields = ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expr!r} needs five fields")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, FIELD_RANGES))
+        self.weekdays = {d % 7 for d in weekdays}  # 0 and 7 are both Sunday
+        # As in cron, when both day fields are restricted a day matching either one runs
+        self.either_day = fields[2] != "*" and fields[4] != "*"
+
+    def _day_matches(self, dt):
+        in_days = dt.day in self.days
+        in_weekdays = (dt.weekday() + 1) % 7 in self.weekdays
+        return in_days or in_weekdays if self.either_day else in_days and in_weekdays
+
+    def next_after(self, dt):
+        """The first matching minute strictly after dt."""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression {self.expr!r} never matches")
+
+
+class Daemon:
+    """Calls run() at each scheduled time and keeps a status record of the results."""
+
+    def __init__(self, schedule, run):
+        self.schedule = schedule
+        self.run = run
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+        self.status = {
+            "schedule": schedule.expr,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "state": "idle",
+            "next_run": None,
+            "cycles": 0,
+            "failures": 0,
+            "last_run": None,
+            "history": [],
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self.status))
+
+    def serve_status(self, port):
+        """Serve GET /status as JSON on 127.0.0.1:port from a background thread."""
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/status"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(daemon.snapshot(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="status", daemon=True).start()
+        print(f"  [daemon] Status at http://127.0.0.1:{self._server.server_port}/status")
+
+    def stop(self):
+        self._stop.set()
+
+    def run_forever(self, run_now=False):
+        """Run cycles until stop() is called."""
+        print(f"  [daemon] Schedule: {self.schedule.expr}")
+        try:
+            while not self._stop.is_set():
+                due = datetime.now() if run_now else self.schedule.next_after(datetime.now())
+                run_now = False
+                with self._lock:
+                    self.status["next_run"] = due.isoformat(timespec="seconds")
+                print(f"  [daemon] Next cycle at {due:%Y-%m-%d %H:%M}")
+                if not self._sleep_until(due):
+                    break
+                self._run_once()
+        finally:
+            if self._server:
+                self._server.shutdown()
+                self._server.server_close()
+            print("  [daemon] Stopped")
+
+    def _sleep_until(self, due):
+        """Wait for due; False if stopped first."""
+        while (remaining := (due - datetime.now()).total_seconds()) > 0:
+            if self._stop.wait(min(remaining, WAKE_SECONDS)):
+                return False
+        return not self._stop.is_set()
+
+    def _run_once(self):
+        started = datetime.now()
+        with self._lock:
+            self.status["state"] = "running"
+        begin = time.perf_counter()
+        record = {"started": started.isoformat(timespec="seconds"), "ok": True}
+        try:
+            record.update(self.run() or {})
+        except Exception as e:
+            traceback.print_exc()
+            record.update(ok=False, error=f"{type(e).__name__}: {e}")
+        record["seconds"] = round(time.perf_counter() - begin, 2)
+        with self._lock:
+            self.status["state"] = "idle"
+            self.status["cycles"] += 1
+            self.status["failures"] += not record["ok"]
+            self.status["last_run"] = record
+            self.status["history"] = ([record] + self.status["history"])[:HISTORY_SIZE]
+        print(f"  [daemon] Cycle {'finished' if record['ok'] else 'failed'} in {record['seconds']}s")
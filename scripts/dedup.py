@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Cross-source deduplication of fetched items.
+
+Two items are the same story if their canonical URLs match (tracking
+parameters, www./old. prefixes, trailing slashes and fragments dropped; a
+reddit link post also matches the page it links to), or if their titles, or
+titles plus snippets, have a Jaccard similarity of at least 0.7 (candidate
+pairs come from MinHash banding, so this stays near-linear). Duplicates are
+merged into the first item seen, which records every contributing source in
+"source_names".
+"""
+
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from textvec import tokenize
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src",
+    "ref_url", "source", "si", "spm", "share", "_hsenc", "_hsmi", "cmpid", "guccounter",
+}
+HOST_PREFIXES = ("www.", "m.", "old.", "np.", "amp.", "mobile.")
+
+# MinHash over title tokens finds candidate pairs (NUM_BANDS bands of
+# ROWS_PER_BAND rows); candidates are confirmed by exact Jaccard similarity.
+NUM_PERM = 16
+ROWS_PER_BAND = 2
+NUM_BANDS = NUM_PERM // ROWS_PER_BAND
+JACCARD_THRESHOLD = 0.7
+MIN_TOKENS = 4
+_MERSENNE = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE)
+    for i in range(NUM_PERM)
+]
+
+
+def canonicalize_url(url):
+    """Normalise a URL so the same page reached different ways compares equal."""
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = parts.netloc.lower()
+    if "@" in host:
+        host = host.split("@", 1)[1]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = parts.path or "/"
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+
+    if host == "youtu.be" and path.strip("/"):
+        host, path, query = "youtube.com", "/watch", [("v", path.strip("/"))] + query
+    elif host == "reddit.com" or host.endswith(".reddit.com"):
+        # /r/<sub>/comments/<id>/<slug>/ and /comments/<id> are the same thread
+        segments = [s for s in path.split("/") if s]
+        if "comments" in segments:
+            i = segments.index("comments")
+            if i + 1 < len(segments):
+                host, path, query = "reddit.com", f"/comments/{segments[i + 1]}", []
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def _hash64(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _token_sets(item):
+    """(title tokens, title + snippet tokens) as sets."""
+    title = set(tokenize(item.get("title", "")))
+    snippet = item.get("snippet", "")
+    full = title | set(tokenize(snippet)) if snippet != item.get("title", "") else title
+    return title, full
+
+
+def minhash(tokens):
+    """MinHash signature of a token set, or None if it is too small to compare."""
+    if len(tokens) < MIN_TOKENS:
+        return None
+    hashes = [_hash64(t) for t in tokens]
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _url_keys(item):
+    keys = {canonicalize_url(item.get("url", ""))}
+    if item.get("link_url"):
+        keys.add(canonicalize_url(item["link_url"]))
+    keys.discard("")
+    return keys
+
+
+def dedup_items(items):
+    """Merge duplicate items across sources. Returns a new list in first-seen order."""
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # Exact matches on canonical URLs
+    seen_urls = {}
+    for i, item in enumerate(items):
+        for key in _url_keys(item):
+            if key in seen_urls:
+                union(seen_urls[key], i)
+            else:
+                seen_urls[key] = i
+
+    # Near-duplicates: MinHash bands propose pairs, Jaccard on the title or
+    # on title + snippet confirms them
+    token_sets = [_token_sets(item) for item in items]
+    buckets = {}
+    for i, (title_tokens, full_tokens) in enumerate(token_sets):
+        signature = minhash(title_tokens)
+        if signature is None:
+            continue
+        for b in range(NUM_BANDS):
+            band = signature[b * ROWS_PER_BAND:(b + 1) * ROWS_PER_BAND]
+            bucket = buckets.setdefault((b, band), [])
+            for j in bucket:
+                if find(i) == find(j):
+                    continue
+                other_title, other_full = token_sets[j]
+                if max(_jaccard(title_tokens, other_title), _jaccard(full_tokens, other_full)) >= JACCARD_THRESHOLD:
+                    union(i, j)
+            bucket.append(i)
+
+    merged = {}
+    order = []
+    for i, item in enumerate(items):
+        root = find(i)
+        if root not in merged:
+            merged[root] = dict(item, source_names=[item.get("source_name", "")])
+            order.append(root)
+            continue
+        target = merged[root]
+        name = item.get("source_name", "")
+        if name and name not in target["source_names"]:
+            target["source_names"].append(name)
+        if len(item.get("snippet", "")) > len(target.get("snippet", "")):
+            target["snippet"] = item["snippet"]
+        if item.get("link_url") and not target.get("link_url"):
+            target["link_url"] = item["link_url"]
+
+    results = []
+    for root in order:
+        item = merged[root]
+        if len(item["source_names"]) > 1:
+            item["source_name"] = " + ".join(item["source_names"])
+        results.append(item)
+    return results
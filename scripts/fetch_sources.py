@@ -5,87 +5,197 @@ All functions return lists of dicts: [{"title", "url", "snippet", "source_name"}
 Zero external dependencies — stdlib only.
 """
 
+import codecs
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
 import re
-import ssl
-import urllib.request
+import threading
+import time
 import xml.etree.ElementTree as ET
 from html.parser import HTMLParser
 from urllib.error import URLError, HTTPError
 
+import http_pool
+from tracing import span
+
 
 # Shared HTTP helpers
 
-def _make_request(url, timeout=15):
-    """Make an HTTP GET request, return response text. Returns None on failure."""
+# Per-response byte cap; sources may override it with a "max_bytes" key.
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+# Items per fetch for the source types that read a "limit" key
+DEFAULT_LIMITS = {"reddit": 10, "hackernews": 15, "rss": 10, "producthunt": 10}
+
+FETCH_WORKERS = 8
+
+# API endpoints fetched from; environment overrides point them at local
+# stand-ins (see bench/stand_ins.py). Links in fetched items keep the real hosts.
+REDDIT_BASE_URL = os.environ.get("REDDIT_BASE_URL", "https://www.reddit.com")
+HN_API_URL = os.environ.get("HN_API_URL", "https://hacker-news.firebaseio.com/v0")
+GITHUB_TRENDING_URL = os.environ.get("GITHUB_TRENDING_URL", "https://github.com/trending")
+PRODUCTHUNT_FEED_URL = os.environ.get("PRODUCTHUNT_FEED_URL", "https://www.producthunt.com/feed")
+
+# Per-thread fetch state set by fetch_all_sources: a count of network and parse errors
+# (so a source that failed can be told from one that is simply empty), plus
+# the shared deadline and cancel event of a time-budgeted fetch.
+_fetch_state = threading.local()
+
+
+def _note_fetch_error():
+    _fetch_state.errors = getattr(_fetch_state, "errors", 0) + 1
+
+
+def _cancelled():
+    cancel = getattr(_fetch_state, "cancel", None)
+    return cancel is not None and cancel.is_set()
+
+
+def _remaining_time():
+    """Seconds left before the fetch deadline, or None when there is none."""
+    deadline = getattr(_fetch_state, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _iter_response_chunks(url, timeout=15, max_bytes=MAX_RESPONSE_BYTES):
+    """Yield decoded text chunks of an HTTP GET response, stopping at max_bytes.
+
+    Errors are printed and end the iteration early; closing the generator
+    closes the connection, so callers can stop reading whenever they like.
+    Under a fetch deadline the timeout is clipped to the time left, and
+    reading stops as soon as the budget's cancel event is set.
+    """
+    remaining_time = _remaining_time()
+    if _cancelled() or (remaining_time is not None and remaining_time <= 0):
+        print(f"  [fetch] Out of time budget, not fetching {url}")
+        return
+    if remaining_time is not None:
+        timeout = min(timeout, remaining_time)
     try:
-        ctx = ssl.create_default_context()
-        req = urllib.request.Request(url, headers={
+        headers = {
             "User-Agent": "BlogBot/1.0 (autonomous research blog)",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        })
-        with urllib.request.urlopen(req, timeout=timeout, context=ctx) as resp:
-            return resp.read().decode("utf-8", errors="replace")
+        }
+        with http_pool.urlopen(url, headers=headers, timeout=timeout) as resp:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            remaining = max_bytes
+            while remaining > 0:
+                chunk = resp.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if _cancelled():
+                    print(f"  [fetch] Cancelled {url} (time budget exhausted)")
+                    return
+                remaining -= len(chunk)
+                yield decoder.decode(chunk)
+            if remaining <= 0:
+                print(f"  [fetch] Truncated {url} at {max_bytes} bytes")
+            yield decoder.decode(b"", final=True)
     except (URLError, HTTPError, TimeoutError, OSError) as e:
+        if isinstance(e, HTTPError):
+            e.close()  # the error response still holds its pooled connection
         print(f"  [fetch] Error fetching {url}: {e}")
+        _note_fetch_error()
+
+
+def _make_request(url, timeout=15, max_bytes=MAX_RESPONSE_BYTES):
+    """Make an HTTP GET request, return response text. Returns None on failure."""
+    chunks = []
+    failed = True
+    for chunk in _iter_response_chunks(url, timeout, max_bytes):
+        chunks.append(chunk)
+        failed = False
+    if failed:
         return None
+    return "".join(chunks)
 
 
-def _make_json_request(url, timeout=15):
+def _make_json_request(url, timeout=15, max_bytes=MAX_RESPONSE_BYTES):
     """Make HTTP GET, parse JSON. Returns None on failure."""
-    text = _make_request(url, timeout)
+    text = _make_request(url, timeout, max_bytes)
     if text is None:
         return None
     try:
         return json.loads(text)
     except json.JSONDecodeError as e:
+        # An error page or a body cut at max_bytes: a failure, not an empty source
         print(f"  [fetch] JSON parse error for {url}: {e}")
+        _note_fetch_error()
         return None
 
 
 class _TextExtractor(HTMLParser):
-    """Extract visible text from HTML."""
-    def __init__(self):
+    """Extract visible text and the <title> from HTML, fed incrementally.
+
+    Once max_len characters of visible text have been collected, `done` is set
+    so callers can stop feeding the rest of the document.
+    """
+    def __init__(self, max_len=None):
         super().__init__()
         self.text_parts = []
+        self.title_parts = []
+        self.max_len = max_len
+        self.done = False
+        self._text_len = 0
         self._skip = False
+        self._in_title = False
+        self._title_done = False
         self._skip_tags = {"script", "style", "noscript", "nav", "footer", "header"}
 
     def handle_starttag(self, tag, attrs):
         if tag in self._skip_tags:
             self._skip = True
+        elif tag == "title" and not self._title_done:
+            # Only the first <title>: later ones are inline SVG titles in the body
+            self._in_title = True
 
     def handle_endtag(self, tag):
         if tag in self._skip_tags:
             self._skip = False
+        elif tag == "title" and self._in_title:
+            self._in_title = False
+            self._title_done = True
 
     def handle_data(self, data):
-        if not self._skip:
-            text = data.strip()
-            if text:
-                self.text_parts.append(text)
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if self._skip or self.done:
+            return
+        text = data.strip()
+        if text:
+            self.text_parts.append(text)
+            self._text_len += len(text) + 1
+            if self.max_len is not None and self._text_len >= self.max_len:
+                self.done = True
 
     def get_text(self):
-        return " ".join(self.text_parts)
+        text = " ".join(self.text_parts)
+        if self.max_len is not None and len(text) > self.max_len:
+            text = text[:self.max_len]
+        return text
+
+    def get_title(self):
+        return " ".join("".join(self.title_parts).split())
 
 
 def _extract_text(html_str, max_len=2000):
     """Extract visible text from HTML string."""
-    parser = _TextExtractor()
+    parser = _TextExtractor(max_len)
     try:
         parser.feed(html_str)
     except Exception:
         pass
-    text = parser.get_text()
-    return text[:max_len] if len(text) > max_len else text
+    return parser.get_text()
 
 
 # Source fetchers
 
-def fetch_reddit_json(subreddit, limit=10):
+def fetch_reddit_json(subreddit, limit=10, max_bytes=MAX_RESPONSE_BYTES):
     """Fetch top posts from a subreddit using Reddit's public JSON API."""
-    url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}"
-    data = _make_json_request(url)
+    url = f"{REDDIT_BASE_URL}/r/{subreddit}/hot.json?limit={limit}"
+    data = _make_json_request(url, max_bytes=max_bytes)
     if not data or "data" not in data:
         return []
     results = []
@@ -95,25 +205,29 @@ def fetch_reddit_json(subreddit, limit=10):
         permalink = post.get("permalink", "")
         selftext = post.get("selftext", "")[:300]
         link_url = post.get("url", "")
-        results.append({
+        item = {
             "title": title,
             "url": f"https://www.reddit.com{permalink}" if permalink else link_url,
             "snippet": selftext or title,
             "source_name": f"r/{subreddit}",
-        })
+        }
+        # Keep the outbound link of link posts so dedup can match it elsewhere
+        if permalink and link_url and not post.get("is_self") and "reddit.com" not in link_url:
+            item["link_url"] = link_url
+        results.append(item)
     return results
 
 
-def fetch_hackernews(limit=15):
+def fetch_hackernews(limit=15, max_bytes=MAX_RESPONSE_BYTES):
     """Fetch top stories from Hacker News via Firebase API."""
-    ids_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-    ids = _make_json_request(ids_url)
+    ids_url = f"{HN_API_URL}/topstories.json"
+    ids = _make_json_request(ids_url, max_bytes=max_bytes)
     if not ids:
         return []
     results = []
     for story_id in ids[:limit]:
-        item_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-        item = _make_json_request(item_url)
+        item_url = f"{HN_API_URL}/item/{story_id}.json"
+        item = _make_json_request(item_url, max_bytes=max_bytes)
         if not item:
             continue
         title = item.get("title", "")
@@ -127,9 +241,9 @@ def fetch_hackernews(limit=15):
     return results
 
 
-def fetch_rss(feed_url, source_name=None, limit=10):
+def fetch_rss(feed_url, source_name=None, limit=10, max_bytes=MAX_RESPONSE_BYTES):
     """Fetch items from an RSS or Atom feed."""
-    text = _make_request(feed_url)
+    text = _make_request(feed_url, max_bytes=max_bytes)
     if not text:
         return []
     results = []
@@ -137,6 +251,12 @@ def fetch_rss(feed_url, source_name=None, limit=10):
         root = ET.fromstring(text)
     except ET.ParseError as e:
         print(f"  [fetch] RSS parse error for {feed_url}: {e}")
+        _note_fetch_error()
+        return []
+    if root.tag.rsplit("}", 1)[-1] not in ("rss", "feed", "RDF"):
+        # Well-formed XML that is not a feed, e.g. an XHTML page where the feed used to be
+        print(f"  [fetch] Not a feed at {feed_url} (root <{root.tag}>)")
+        _note_fetch_error()
         return []
 
     # Handle RSS 2.0
@@ -200,15 +320,30 @@ def fetch_rss(feed_url, source_name=None, limit=10):
     return results
 
 
-def fetch_webpage_extract(url, source_name=None):
-    """Fetch a web page and extract text content. Returns a single-item list."""
-    text = _make_request(url)
-    if not text:
+def fetch_webpage_extract(url, source_name=None, max_bytes=MAX_RESPONSE_BYTES, max_len=2000):
+    """Fetch a web page and extract text content. Returns a single-item list.
+
+    The body is streamed into the text extractor chunk by chunk, and reading
+    stops as soon as enough visible text has been collected.
+    """
+    parser = _TextExtractor(max_len)
+    received = False
+    chunks = _iter_response_chunks(url, max_bytes=max_bytes)
+    try:
+        for chunk in chunks:
+            received = True
+            try:
+                parser.feed(chunk)
+            except Exception:
+                break
+            if parser.done:
+                break
+    finally:
+        chunks.close()
+    if not received:
         return []
-    # Try to get title
-    title_match = re.search(r'<title[^>]*>([^<]+)</title>', text, re.IGNORECASE)
-    title = title_match.group(1).strip() if title_match else url
-    extracted = _extract_text(text)
+    title = parser.get_title() or url
+    extracted = parser.get_text()
     return [{
         "title": title,
         "url": url,
@@ -217,45 +352,237 @@ def fetch_webpage_extract(url, source_name=None):
     }]
 
 
-def fetch_github_trending(language=None, since="weekly"):
+class _TrendingParser(HTMLParser):
+    """Walk a GitHub trending page once, collecting one record per repo row.
+
+    Each record is {"repo", "description", "language", "stars"}. Rows are
+    <article class="Box-row"> blocks; a bare <h2 class="... lh-condensed">
+    also starts a record so older markup without articles still parses.
+    """
+    def __init__(self, limit=None):
+        super().__init__()
+        self.records = []
+        self.limit = limit
+        self.done = False
+        self._current = None
+        self._in_article = False
+        self._capture = None  # "repo", "description", "language" or "stars"
+        self._parts = []
+
+    def _start_record(self):
+        self._finish_record()
+        self._current = {"repo": "", "description": "", "language": "", "stars": None}
+
+    def _finish_record(self):
+        if self._current and self._current["repo"]:
+            self.records.append(self._current)
+            if self.limit is not None and len(self.records) >= self.limit:
+                self.done = True
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "article" and "Box-row" in classes:
+            self._in_article = True
+            self._start_record()
+        elif tag == "h2" and "lh-condensed" in classes:
+            if not self._in_article:
+                self._start_record()
+            self._capture = "repo"
+        elif self._current is None:
+            return
+        elif tag == "a" and self._capture == "repo" and not self._current["repo"]:
+            href = attrs.get("href") or ""
+            if href.count("/") == 2:
+                self._current["repo"] = href.strip("/")
+        elif tag == "p" and not self._current["description"]:
+            self._capture = "description"
+            self._parts = []
+        elif tag == "span" and attrs.get("itemprop") == "programmingLanguage":
+            self._capture = "language"
+            self._parts = []
+        elif tag == "a" and (attrs.get("href") or "").endswith("/stargazers"):
+            self._capture = "stars"
+            self._parts = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == "article" and self._in_article:
+            self._in_article = False
+            self._finish_record()
+        elif tag == "h2" and self._capture == "repo":
+            self._capture = None
+        elif self._current is None or self._capture is None:
+            return
+        elif tag == "p" and self._capture == "description":
+            self._current["description"] = " ".join("".join(self._parts).split())
+            self._capture = None
+        elif tag == "span" and self._capture == "language":
+            self._current["language"] = "".join(self._parts).strip()
+            self._capture = None
+        elif tag == "a" and self._capture == "stars":
+            digits = re.sub(r"[^0-9]", "", "".join(self._parts))
+            self._current["stars"] = int(digits) if digits else None
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture in ("description", "language", "stars"):
+            self._parts.append(data)
+
+    def close(self):
+        super().close()
+        self._finish_record()
+
+
+def parse_github_trending(html_str, limit=None):
+    """Parse a trending page into [{"repo", "description", "language", "stars"}]."""
+    parser = _TrendingParser(limit)
+    try:
+        for start in range(0, len(html_str), READ_CHUNK_SIZE):
+            parser.feed(html_str[start:start + READ_CHUNK_SIZE])
+            if parser.done:
+                break
+        parser.close()
+    except Exception:
+        pass
+    return parser.records
+
+
+def fetch_github_trending(language=None, since="weekly", max_bytes=MAX_RESPONSE_BYTES, limit=15):
     """Scrape GitHub trending page for trending repos."""
-    url = "https://github.com/trending"
+    url = GITHUB_TRENDING_URL
     if language:
         url += f"/{language}"
     url += f"?since={since}"
-    text = _make_request(url)
-    if not text:
-        return []
+    parser = _TrendingParser(limit)
+    chunks = _iter_response_chunks(url, max_bytes=max_bytes)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            if parser.done:
+                break
+        parser.close()
+    except Exception as e:
+        print(f"  [fetch] Trending parse error for {url}: {e}")
+        _note_fetch_error()
+    finally:
+        chunks.close()
+
     results = []
-    # Parse repo links from trending page
-    repo_pattern = r'<h2 class="h3 lh-condensed">\s*<a href="(/[^"]+)"'
-    matches = re.findall(repo_pattern, text)
-    # Also try alternate pattern
-    if not matches:
-        matches = re.findall(r'href="(/[^/]+/[^"]+)"[^>]*class="[^"]*Link[^"]*"', text)
-
-    for path in matches[:15]:
-        repo_name = path.strip("/")
-        # Try to find description
-        desc_pattern = re.escape(path) + r'.*?<p class="[^"]*">\s*(.+?)\s*</p>'
-        desc_match = re.search(desc_pattern, text, re.DOTALL)
-        snippet = desc_match.group(1).strip() if desc_match else repo_name
-        snippet = re.sub(r'<[^>]+>', '', snippet).strip()
+    for record in parser.records:
+        repo_name = record["repo"]
+        snippet = record["description"] or repo_name
+        details = [record["language"]] if record["language"] else []
+        if record["stars"] is not None:
+            details.append(f"{record['stars']:,} stars")
+        if details:
+            snippet = f"{snippet[:260]} ({', '.join(details)})"
         results.append({
             "title": repo_name,
-            "url": f"https://github.com{path}",
+            "url": f"https://github.com/{repo_name}",
             "snippet": snippet[:300],
             "source_name": "GitHub Trending",
         })
     return results
 
 
-def fetch_producthunt(limit=10):
+def fetch_producthunt(limit=10, max_bytes=MAX_RESPONSE_BYTES):
     """Fetch from Product Hunt's RSS feed."""
-    return fetch_rss("https://www.producthunt.com/feed", source_name="Product Hunt", limit=limit)
+    return fetch_rss(PRODUCTHUNT_FEED_URL, source_name="Product Hunt", limit=limit, max_bytes=max_bytes)
+
+
+def source_key(source):
+    """Stable identifier for a source config entry, used by health and caches."""
+    source_type = source.get("type", "")
+    if source_type == "reddit":
+        return f"reddit:{source.get('subreddit', '').lower()}"
+    if source_type in ("rss", "webpage"):
+        return f"{source_type}:{source.get('url', '')}"
+    if source_type == "github_trending":
+        return f"github_trending:{source.get('language') or ''}:{source.get('since', 'weekly')}"
+    if source_type in ("hackernews", "producthunt"):
+        return source_type
+    return f"{source_type}:{source.get('name', '')}"
+
+
+def source_limit(source):
+    """How many items a fetch of this source returns at most, or None if it takes no "limit"."""
+    default = DEFAULT_LIMITS.get(source.get("type", ""))
+    return None if default is None else source.get("limit", default)
+
+
+def fetch_source(source):
+    """Fetch a single source config entry. Returns a list of items."""
+    source_type = source.get("type", "")
+    name = source.get("name", source_type)
+    max_bytes = source.get("max_bytes", MAX_RESPONSE_BYTES)
+    limit = source_limit(source)
+    if source_type == "reddit":
+        return fetch_reddit_json(source["subreddit"], limit=limit, max_bytes=max_bytes)
+    elif source_type == "hackernews":
+        return fetch_hackernews(limit=limit, max_bytes=max_bytes)
+    elif source_type == "rss":
+        return fetch_rss(source["url"], source_name=name, limit=limit, max_bytes=max_bytes)
+    elif source_type == "webpage":
+        return fetch_webpage_extract(source["url"], source_name=name, max_bytes=max_bytes)
+    elif source_type == "github_trending":
+        return fetch_github_trending(language=source.get("language"), since=source.get("since", "weekly"), max_bytes=max_bytes)
+    elif source_type == "producthunt":
+        return fetch_producthunt(limit=limit, max_bytes=max_bytes)
+    print(f"  [fetch] Unknown source type: {source_type}")
+    return []
+
+
+def _fetch_with_state(source, deadline, cancel):
+    """Run fetch_source on a worker thread. Returns (items, latency, error)."""
+    _fetch_state.errors = 0
+    _fetch_state.deadline = deadline
+    _fetch_state.cancel = cancel
+    name = source.get("name", source.get("type", ""))
+    started = time.monotonic()
+    error = None
+    with span("fetch_source", cat="fetch", source=source_key(source)) as details:
+        try:
+            items = fetch_source(source)
+        except Exception as e:
+            print(f"  [fetch] Error with {name}: {e}")
+            items = []
+            error = e
+        if error is None and not items and _fetch_state.errors:
+            error = f"{_fetch_state.errors} fetch error(s), no items"
+        details["items"] = len(items)
+    return items, time.monotonic() - started, error
+
+
+def fetch_each(sources, budget=None, workers=FETCH_WORKERS):
+    """Fetch sources concurrently on `workers` threads.
+
+    Returns {source_key: (items, latency, error)}, with None for sources
+    still running when the `budget` in seconds ran out (they are cancelled).
+    """
+    results = {}
+    if not sources:
+        return results
+    deadline = time.monotonic() + budget if budget else None
+    cancel = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources))))
+    futures = {source_key(source): executor.submit(_fetch_with_state, source, deadline, cancel)
+               for source in sources}
+    done, pending = wait(futures.values(), timeout=budget or None)
+    if pending:
+        cancel.set()
+    executor.shutdown(wait=False, cancel_futures=True)
+    for key, future in futures.items():
+        results[key] = future.result() if future in done else None
+    return results
 
 
-def fetch_all_sources(sources_config):
+def fetch_all_sources(sources_config, health=None, budget=None, report=None, workers=FETCH_WORKERS,
+                      store=None, max_age_hours=None, prefetched=None):
     """Fetch all enabled sources from sources.json config.
 
     sources_config format:
@@ -267,37 +594,106 @@ def fetch_all_sources(sources_config):
         {"type": "github_trending", "language": "python", "enabled": true, "name": "GitHub Trending"},
         {"type": "producthunt", "enabled": true, "name": "Product Hunt"}
     ]
+
+    Any source may set "max_bytes" to cap how much of each response is read,
+    and "priority" (default 0; higher starts first) to order the fetches.
+
+    Sources are fetched concurrently on `workers` threads. With a `budget`
+    in seconds, whatever has not finished when it runs out is cancelled and
+    the items that did arrive are returned. Entries with the same
+    source_key are fetched and recorded once, under the first (highest
+    priority) entry. If a `report` dict is given it receives "cut_off",
+    "skipped", "cached" and "duplicates" name lists and per-source "latency".
+
+    With an ItemStore, every successful fetch is saved to it, and sources
+    fetched within the last `max_age_hours` are read back from it instead
+    of the network.
+
+    If a SourceHealth store is given, sources in a backoff window sit this
+    cycle out without a network call (counting down the window), and every attempt's outcome and latency is
+    recorded. A source counts as failed if it raised, or if it returned no
+    items and hit network errors along the way. Cut-off sources are not
+    counted either way.
+
+    `prefetched` holds fetch_each results from a fetch shared between sites
+    (see multi_site.py); sources found there are taken from it instead of
+    the network, cut to this entry's own limit (the shared fetch used the
+    largest any site asked for), and otherwise handled exactly as if
+    fetched here.
     """
+    report = report if report is not None else {}
+    report.update({"cut_off": [], "skipped": [], "cached": [], "duplicates": [], "latency": {}})
+    enabled = [s for s in sources_config if s.get("enabled", True)]
+    enabled.sort(key=lambda s: -s.get("priority", 0))
+    # One fetch and one health record per source key: entries listing the same
+    # feed (under the same or another name) would otherwise count each failure twice
+    unique = {}
+    for source in enabled:
+        first = unique.setdefault(source_key(source), source)
+        if first is not source:
+            name = source.get("name", source.get("type", ""))
+            print(f"  [fetch] {name}: same source as {first.get('name', first.get('type', ''))}, fetched once")
+            report["duplicates"].append(name)
+    enabled = list(unique.values())
+
+    cached = {}
+    to_fetch = []
+    for source in enabled:
+        name = source.get("name", source.get("type", ""))
+        if store is not None and store.is_fresh(source_key(source), max_age_hours):
+            cached[id(source)] = store.get_items(source_key(source))
+            report["cached"].append(name)
+            print(f"  [fetch] {name}: {len(cached[id(source)])} items from store")
+            continue
+        if health is not None:
+            ok, reason = health.should_fetch(source_key(source))
+            if not ok:
+                health.record_skip(source_key(source))
+                print(f"  [fetch] {name}: skipped ({reason})")
+                report["skipped"].append(name)
+                continue
+            if reason != "closed":
+                print(f"  [fetch] {name}: {reason}")
+        to_fetch.append(source)
+
+    prefetched = prefetched or {}
+    results = fetch_each([s for s in to_fetch if source_key(s) not in prefetched], budget, workers)
+    for source in to_fetch:
+        key = source_key(source)
+        if key not in prefetched:
+            continue
+        shared, limit = prefetched[key], source_limit(source)
+        if shared is not None and limit is not None:
+            shared = (shared[0][:limit], *shared[1:])
+        results[key] = shared
+
     all_items = []
-    for source in sources_config:
-        if not source.get("enabled", True):
+    for source in enabled:
+        name = source.get("name", source.get("type", ""))
+        if id(source) in cached:
+            all_items.extend(cached[id(source)])
             continue
-        source_type = source.get("type", "")
-        name = source.get("name", source_type)
-        try:
-            if source_type == "reddit":
-                items = fetch_reddit_json(source["subreddit"], limit=source.get("limit", 10))
-            elif source_type == "hackernews":
-                items = fetch_hackernews(limit=source.get("limit", 15))
-            elif source_type == "rss":
-                items = fetch_rss(source["url"], source_name=name, limit=source.get("limit", 10))
-            elif source_type == "webpage":
-                items = fetch_webpage_extract(source["url"], source_name=name)
-            elif source_type == "github_trending":
-                items = fetch_github_trending(language=source.get("language"), since=source.get("since", "weekly"))
-            elif source_type == "producthunt":
-                items = fetch_producthunt(limit=source.get("limit", 10))
-            else:
-                print(f"  [fetch] Unknown source type: {source_type}")
-                items = []
-            print(f"  [fetch] {name}: {len(items)} items")
+        key = source_key(source)
+        if key not in results:
+            continue
+        if results[key] is None:
+            report["cut_off"].append(name)
+            print(f"  [fetch] {name}: cut off by the {budget}s fetch budget")
+            continue
+        items, latency, error = results[key]
+        report["latency"][name] = round(latency, 3)
+        if error is None:
+            print(f"  [fetch] {name}: {len(items)} items ({latency:.1f}s)")
             all_items.extend(items)
-            # Mark source as successfully fetched
-            source["_last_success"] = True
-        except Exception as e:
-            print(f"  [fetch] Error with {name}: {e}")
-            source["_last_success"] = False
-            source["_consecutive_failures"] = source.get("_consecutive_failures", 0) + 1
+            if store is not None:
+                store.put_items(key, items)
+            if health is not None:
+                health.record_success(key, latency)
+        elif health is not None:
+            health.record_failure(key, latency, error)
+            record = health.get(key)
+            print(f"  [fetch] {name}: failed {record['consecutive_failures']}x, "
+                  f"skipping the next {record['skip_cycles']} cycle{'s' if record['skip_cycles'] > 1 else ''}")
     return all_items
 
 
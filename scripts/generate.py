@@ -2,17 +2,20 @@
 """Core orchestrator: autonomous blog generation cycle.
 
 Full cycle: wake up -> fetch sources -> select topic -> write post -> reflect -> build -> commit.
-Zero external dependencies — stdlib only, Claude API via raw urllib.
+Zero external dependencies — stdlib only, Claude API via raw HTTPS (see claude_client).
+
+`generate.py daemon` runs cycles on a cron schedule in one long-lived process
+instead (see run_daemon and daemon.py).
 """
 
 import argparse
 import json
 import os
 import re
-import ssl
+import signal
 import subprocess
 import sys
-import urllib.request
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -20,89 +23,55 @@ from pathlib import Path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 
-from fetch_sources import fetch_all_sources
-from build import build_site, build_about_page
-
-
-# --- Claude API ---
-
-CLAUDE_API_URL = "https://api.anthropic.com/v1/messages"
-CLAUDE_MODEL = "claude-sonnet-4-20250514"
-
-
-def call_claude(system_prompt, user_prompt, api_key, max_tokens=4096, temperature=0.8):
-    """Call Claude via API (if api_key provided) or CLI (claude -p) for local runs."""
-    if api_key:
-        # --- API path (GitHub Actions) ---
-        payload = json.dumps({
-            "model": CLAUDE_MODEL,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "system": system_prompt,
-            "messages": [{"role": "user", "content": user_prompt}],
-        }).encode("utf-8")
-
-        req = urllib.request.Request(CLAUDE_API_URL, data=payload, headers={
-            "Content-Type": "application/json",
-            "x-api-key": api_key,
-            "anthropic-version": "2023-06-01",
-        })
-
-        ctx = ssl.create_default_context()
-        try:
-            with urllib.request.urlopen(req, timeout=120, context=ctx) as resp:
-                result = json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8", errors="replace")
-            print(f"  [claude] API error {e.code}: {error_body[:500]}")
-            raise RuntimeError(f"Claude API returned {e.code}: {error_body[:200]}")
-
-        for block in result.get("content", []):
-            if block.get("type") == "text":
-                return block["text"]
-        return ""
-    else:
-        # --- CLI path (local / Task Scheduler) ---
-        import shutil
-        claude_bin = shutil.which("claude") or os.path.expandvars(r"%APPDATA%\npm\claude.cmd")
-        print(f"  [claude] Using claude CLI: {claude_bin}")
-        cmd = [claude_bin, "-p", "--model", "sonnet", "--output-format", "text"]
-        # Combine system+user prompt and pipe via stdin to avoid Windows cmd length limit
-        full_prompt = f"[System instructions]\n{system_prompt}\n\n[User request]\n{user_prompt}" if system_prompt else user_prompt
-        result = subprocess.run(cmd, input=full_prompt, capture_output=True, text=True, timeout=300, encoding="utf-8")
-        if result.returncode != 0:
-            print(f"  [claude] CLI error: {result.stderr[:500]}")
-            raise RuntimeError(f"claude CLI failed (exit {result.returncode}): {result.stderr[:200]}")
-        return result.stdout.strip()
+import claude_client
+from claude_client import call_claude, system_blocks, system_text
+from checkpoint import RunCheckpoint
+from daemon import CronSchedule, Daemon
+from dedup import dedup_items
+from fetch_sources import fetch_all_sources, source_key
+from rank import rank_items
+from item_store import ItemStore, default_store_path
+import memory_index
+import novelty
+import tokens
+from tokens import Section, fit_sections
+from source_health import SourceHealth
+from state_store import StateStore
+from build import build_site, build_about_page, build_pages
+from scheduler import Step, run_dag
+import http_pool
+import tracing
+from tracing import span
 
 
 # --- Config loading ---
 
-def load_json(path):
-    """Load JSON file, return empty dict/list if missing."""
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
+def load_all_config(repo_root, state=None):
+    """Load all config files through one state store; steps commit their changes via config["state"].
 
-def save_json(path, data):
-    """Save JSON file with pretty printing."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-
-def load_all_config(repo_root):
-    """Load all config files."""
-    config_dir = os.path.join(repo_root, "config")
+    A daemon passes its long-lived store, so documents stay in memory between
+    cycles; any edited on disk since are reloaded first.
+    """
+    if state is None:
+        state = StateStore(repo_root)
+    state.refresh()
+    state.changed_paths.clear()
     return {
-        "persona": load_json(os.path.join(config_dir, "persona.json")),
-        "soul": load_json(os.path.join(config_dir, "soul.json")),
-        "memory": load_json(os.path.join(config_dir, "memory.json")),
-        "sources": load_json(os.path.join(config_dir, "sources.json")),
+        "state": state,
+        "persona": state.get("persona"),
+        "soul": state.get("soul"),
+        "memory": state.get("memory"),
+        "sources": state.get("sources"),
     }
 
 
+def memory_for_prompt(repo_root, config, query_text, budget, kinds=None, label="memory"):
+    """(soul, memory) views holding only the entries most relevant to query_text, within budget tokens."""
+    index = memory_index.load_index(repo_root, config["soul"], config["memory"])
+    return memory_index.select(index, config["soul"], config["memory"], query_text, budget,
+                               kinds=kinds, label=label)
+
+
 # --- Post history ---
 
 def get_existing_posts(repo_root):
@@ -132,34 +101,128 @@ def get_existing_posts(repo_root):
 
 # --- Core generation steps ---
 
-def step_fetch(repo_root, config):
-    """Step 2: Fetch all sources."""
+# Hard upper bound on the fetch stage; sources still running are cut off.
+FETCH_BUDGET_SECONDS = 90
+# Sources fetched more recently than this are read back from the item store.
+ITEM_MAX_AGE_HOURS = 6
+
+
+def step_fetch(repo_root, config, budget=FETCH_BUDGET_SECONDS, max_age_hours=ITEM_MAX_AGE_HOURS, prefetched=None):
+    """Step 2: Fetch all sources within a time budget, reusing fresh stored items.
+
+    Sources that are backing off after failures are skipped; sources in
+    `prefetched` (a fetch shared with other sites) are not fetched again.
+    """
     print("\n=== STEP 2: Fetching sources ===")
     sources = config["sources"]
     if isinstance(sources, dict):
         source_list = sources.get("sources", [])
     else:
         source_list = sources
-    items = fetch_all_sources(source_list)
+    health = source_health(repo_root, config)
+    report = {}
+    store = ItemStore(default_store_path(repo_root))
+    try:
+        items = fetch_all_sources(source_list, health=health, budget=budget, report=report,
+                                  store=store, max_age_hours=max_age_hours, prefetched=prefetched)
+    finally:
+        store.close()
+    config["state"].mark_dirty("source_health")
+    commit_state(config)
+    config["fetch_report"] = report
+    fetched = len(items)
+    items = dedup_items(items)
+    if len(items) < fetched:
+        print(f"  Merged {fetched - len(items)} duplicate items across sources")
+    if report["cached"]:
+        print(f"  Reused {len(report['cached'])} sources from the item store (< {max_age_hours}h old)")
+    if report["cut_off"]:
+        print(f"  Cut off by the {budget}s budget: {', '.join(report['cut_off'])}")
     print(f"  Total items fetched: {len(items)}")
     return items
 
 
-def step_select_topic(config, fetched_items, existing_posts, api_key):
+# How many of the ranked items each step sees
+SELECT_TOP_K = 50
+WRITE_TOP_K = 5
+REFLECT_TOP_K = 20
+
+# Re-prompts allowed when the chosen topic is too close to an existing post
+NOVELTY_RETRIES = 2
+
+# Token budgets for the soul/memory entries retrieved into each prompt
+SELECT_MEMORY_BUDGET = 600
+WRITE_MEMORY_BUDGET = 500
+REFLECT_MEMORY_BUDGET = 1500
+
+# Whole-prompt token budgets (system + user) per step; --prompt-budget overrides
+PROMPT_BUDGETS = {"select_topic": 6000, "write_post": 4000, "reflect": 6000}
+
+
+def fit_prompt(step, system, render, sections):
+    """User prompt for `step` with its trimmable sections fitted into PROMPT_BUDGETS[step].
+
+    render(texts) builds the user prompt from {section name: text}; everything
+    else in the prompt (system blocks, fixed instructions) is measured by
+    rendering with empty sections and is never trimmed.
+    """
+    fixed = system_text(system) + render({s.name: "" for s in sections})
+    texts = fit_sections([Section("fixed", fixed)] + sections, PROMPT_BUDGETS[step], step)
+    return render(texts)
+
+
+def step_rank(config, fetched_items):
+    """Step 2b: Rank fetched items against interests, threads and follow-ups."""
+    ranked = rank_items(fetched_items, config["soul"], config["memory"], now=config["now"].timestamp())
+    for item in ranked[:5]:
+        print(f"  [{item['rank_score']:.2f}] {item['source_name']}: {item['title'][:70]}")
+    return ranked
+
+
+def persona_prefix(persona):
+    """Stable persona description shared by every prompt, so it is cached once per cycle.
+
+    Built only from persona.json, which changes rarely; keep anything that
+    varies between calls out of it or the cache prefix stops matching.
+    """
+    cat_formats = persona.get("category_formats", {})
+    cat_descriptions = []
+    for cat in persona.get("categories", []):
+        fmt = cat_formats.get(cat, {})
+        if fmt:
+            cat_descriptions.append(f"- {cat} ({fmt.get('format', 'medium')}, {fmt.get('words', '800-1200')} words): {fmt.get('description', '')}")
+        else:
+            cat_descriptions.append(f"- {cat}")
+    return f"""{persona.get('voice_prompt', 'You are a blog writer.')}
+
+Your persona in brief: {persona.get('voice_description', '')}
+
+Writing rules:
+{chr(10).join('- ' + r for r in persona.get('writing_rules', []))}
+
+Vocabulary preferences: {', '.join(persona.get('vocabulary', [])) if persona.get('vocabulary') else 'natural'}
+
+Your content categories for {persona.get('site_name', 'the blog')} (each has a different format and length):
+{chr(10).join(cat_descriptions)}"""
+
+
+def step_select_topic(config, fetched_items, existing_posts, api_key, repo_root):
     """Step 3: Use Claude to select a topic from fetched items."""
     print("\n=== STEP 3: Selecting topic ===")
     persona = config["persona"]
-    soul = config["soul"]
-    memory = config["memory"]
+    soul, memory = memory_for_prompt(
+        repo_root, config, " ".join(item["title"] for item in fetched_items[:SELECT_TOP_K]),
+        SELECT_MEMORY_BUDGET, kinds=("current_interests", "threads_to_explore", "topics_exhausted",
+                                     "follow_up_threads"))
 
     # Build context about what's available
     source_summaries = []
-    for item in fetched_items[:50]:  # Cap at 50 items to keep prompt reasonable
+    for item in fetched_items[:SELECT_TOP_K]:  # Top-ranked items only, to keep the prompt small
         source_summaries.append(f"- [{item['source_name']}] {item['title']}: {item['snippet'][:150]}")
     source_text = "\n".join(source_summaries) if source_summaries else "No items fetched this cycle."
 
-    # Previous post titles for dedup
-    prev_titles = [p.get("title", "") for p in existing_posts[-20:]]
+    # Previous post titles for dedup, most recent first so trimming drops the oldest
+    prev_titles = [p.get("title", "") for p in reversed(existing_posts[-20:])]
     prev_text = "\n".join(f"- {t}" for t in prev_titles) if prev_titles else "No previous posts yet."
 
     # Current interests and threads
@@ -168,17 +231,6 @@ def step_select_topic(config, fetched_items, existing_posts, api_key):
     exhausted = soul.get("topics_exhausted", [])
     follow_ups = memory.get("follow_up_threads", [])
 
-    # Build category format descriptions
-    cat_formats = persona.get("category_formats", {})
-    cat_descriptions = []
-    for cat in persona.get("categories", []):
-        fmt = cat_formats.get(cat, {})
-        if fmt:
-            cat_descriptions.append(f"- {cat} ({fmt.get('format', 'medium')}, {fmt.get('words', '800-1200')} words): {fmt.get('description', '')}")
-        else:
-            cat_descriptions.append(f"- {cat}")
-    cat_text = "\n".join(cat_descriptions)
-
     # Count recent posts per category for balance
     recent_cats = [p.get("category", "") for p in existing_posts[-10:]]
     cat_counts = {}
@@ -186,11 +238,7 @@ def step_select_topic(config, fetched_items, existing_posts, api_key):
         cat_counts[c] = cat_counts.get(c, 0) + 1
     balance_note = ", ".join(f"{k}: {v}" for k, v in cat_counts.items()) if cat_counts else "none yet"
 
-    system = f"""You are the editorial brain of {persona.get('site_name', 'a blog')}.
-Your persona: {persona.get('voice_description', '')}
-
-Your content categories (each has a different format and length):
-{cat_text}
+    system = system_blocks([persona_prefix(persona)], f"""Right now you are acting as the editorial brain of {persona.get('site_name', 'a blog')}.
 
 Your job: pick the best topic for this week's post AND the right category/format for it. Consider:
 1. Your current interests: {', '.join(interests) if interests else 'broadly curious'}
@@ -198,14 +246,15 @@ Your job: pick the best topic for this week's post AND the right category/format
 3. Follow-up threads from memory: {json.dumps([t.get('thread','') for t in follow_ups if t.get('status')=='pending']) if follow_ups else 'none'}
 4. Topics to avoid (exhausted): {', '.join(exhausted) if exhausted else 'none'}
 5. Category balance (recent posts): {balance_note} — vary the format, don't always write the same type
-6. Match the format to the material — a quick interesting find should be a Dispatch/Report, a deep thread deserves a Deep piece"""
+6. Match the format to the material — a quick interesting find should be a Dispatch/Report, a deep thread deserves a Deep piece""")
 
-    user = f"""Here are the items I found from my sources this week:
+    def render(t):
+        return f"""Here are the items I found from my sources this week:
 
-{source_text}
+{t['items']}
 
 My previous posts (avoid repeating):
-{prev_text}
+{t['previous_posts']}
 
 Pick a topic and return ONLY valid JSON (no markdown, no explanation):
 {{
@@ -216,45 +265,77 @@ Pick a topic and return ONLY valid JSON (no markdown, no explanation):
     "why": "brief reason this topic and format fit"
 }}"""
 
-    response = call_claude(system, user, api_key, max_tokens=500, temperature=0.9)
+    user = fit_prompt("select_topic", system, render, [
+        Section("items", source_text, priority=1),
+        Section("previous_posts", prev_text, priority=2),
+    ])
+    response = call_claude(system, user, api_key, max_tokens=500, temperature=0.9, label="select_topic", repo_root=repo_root)
+    topic_data = _parse_topic(response, persona)
+
+    # Check the pick against the whole archive before a long-form call is spent on it
+    index = novelty.load_index(repo_root)
+    for attempt in range(NOVELTY_RETRIES + 1):
+        neighbours = index.nearest(f"{topic_data.get('topic', '')} {topic_data.get('angle', '')}")
+        if not neighbours or neighbours[0][0] < novelty.NOVELTY_THRESHOLD:
+            break
+        print(f"  [novelty] '{topic_data.get('topic', '')}' is {neighbours[0][0]:.2f} similar to "
+              f"{neighbours[0][1]['file']}")
+        if attempt == NOVELTY_RETRIES:
+            print("  [novelty] Still too close after re-prompting; keeping the last pick")
+            break
+        nearest_text = "\n".join(f"- {post['title']} ({post['date']}, similarity {score:.2f}): {post['excerpt']}"
+                                  for score, post in neighbours)
+        retry_user = f"""{user}
+
+You previously picked: {json.dumps(topic_data)}
+That is too close to posts I have already written:
+{nearest_text}
+
+Pick a clearly different topic, or an angle none of these posts takes. Return ONLY valid JSON in the same format."""
+        response = call_claude(system, retry_user, api_key, max_tokens=500, temperature=0.9,
+                               label="select_topic_retry", repo_root=repo_root)
+        topic_data = _parse_topic(response, persona)
 
-    # Parse JSON from response
+    print(f"  Selected topic: {topic_data.get('topic', 'unknown')}")
+    print(f"  Category: {topic_data.get('category', 'unknown')}")
+    print(f"  Angle: {topic_data.get('angle', 'unknown')}")
+    return topic_data
+
+
+def _parse_topic(response, persona):
+    """Topic JSON from a select_topic response, or a fallback topic."""
     try:
         # Try to extract JSON if wrapped in markdown
         json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response, re.DOTALL)
         if json_match:
-            topic_data = json.loads(json_match.group())
-        else:
-            topic_data = json.loads(response)
+            return json.loads(json_match.group())
+        return json.loads(response)
     except json.JSONDecodeError:
         print(f"  Warning: Could not parse topic selection. Raw response:\n{response[:500]}")
-        topic_data = {
+        return {
             "topic": "Interesting finds this week",
             "category": persona.get("categories", ["General"])[0],
             "angle": "A roundup of intriguing discoveries",
             "why": "Fallback topic",
         }
 
-    print(f"  Selected topic: {topic_data.get('topic', 'unknown')}")
-    print(f"  Category: {topic_data.get('category', 'unknown')}")
-    print(f"  Angle: {topic_data.get('angle', 'unknown')}")
-    return topic_data
-
 
-def step_write_post(config, topic_data, fetched_items, api_key):
+def step_write_post(config, topic_data, fetched_items, api_key, repo_root):
     """Step 4: Use Claude to write the full post."""
     print("\n=== STEP 4: Writing post ===")
     persona = config["persona"]
-    soul = config["soul"]
+    query = " ".join(str(topic_data.get(k, "")) for k in ("topic", "angle", "category"))
+    soul, _ = memory_for_prompt(repo_root, config, query, WRITE_MEMORY_BUDGET,
+                                kinds=("developing_opinions",), label="opinions")
 
     # Get relevant source items
     relevant_items = []
     for item in fetched_items:
         if item["title"] in topic_data.get("source_items", []):
             relevant_items.append(item)
-    # If none matched by title, include first few
+    # If none matched by title, include the top-ranked few
     if not relevant_items:
-        relevant_items = fetched_items[:5]
+        relevant_items = fetched_items[:WRITE_TOP_K]
 
     source_context = "\n".join(
         f"- [{item['source_name']}] {item['title']}: {item['snippet'][:300]}\n  URL: {item['url']}"
@@ -264,17 +345,12 @@ def step_write_post(config, topic_data, fetched_items, api_key):
     voice_notes = soul.get("voice_notes", [])
     opinions = soul.get("developing_opinions", [])
 
-    system = f"""{persona.get('voice_prompt', 'You are a blog writer.')}
-
-Writing rules:
-{chr(10).join('- ' + r for r in persona.get('writing_rules', []))}
+    system = system_blocks([persona_prefix(persona)], f"""Right now you are writing this week's post.
 
 Voice/style notes from experience: {'; '.join(voice_notes) if voice_notes else 'none yet'}
 
 Your developing opinions on relevant topics:
-{json.dumps(opinions) if opinions else 'none yet — feel free to start forming them'}
-
-Vocabulary preferences: {', '.join(persona.get('vocabulary', [])) if persona.get('vocabulary') else 'natural'}"""
+{json.dumps(opinions) if opinions else 'none yet — feel free to start forming them'}""")
 
     # Get format guidance for this category
     cat_formats = persona.get("category_formats", {})
@@ -292,8 +368,9 @@ Vocabulary preferences: {', '.join(persona.get('vocabulary', [])) if persona.get
     }
     length_instruction = format_instructions.get(format_type, f"{word_range} words.")
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    user = f"""Write a blog post about: {topic_data.get('topic', '')}
+    today = config["now"].strftime("%Y-%m-%d")
+    def render(t):
+        return f"""Write a blog post about: {topic_data.get('topic', '')}
 Angle: {topic_data.get('angle', '')}
 Category: {topic_data.get('category', '')}
 Format: {format_desc}
@@ -301,7 +378,7 @@ Format: {format_desc}
 {length_instruction}
 
 Source material:
-{source_context}
+{t['sources']}
 
 Output the post in this EXACT format (start with --- on the first line):
 
@@ -315,7 +392,8 @@ tags: "tag1, tag2, tag3"
 
 [Post body in markdown. {word_range} words. Write in your voice — be specific, opinionated, and engaging.]"""
 
-    response = call_claude(system, user, api_key, max_tokens=max_tok, temperature=0.8)
+    user = fit_prompt("write_post", system, render, [Section("sources", source_context, priority=1)])
+    response = call_claude(system, user, api_key, max_tokens=max_tok, temperature=0.8, label="write_post", repo_root=repo_root)
 
     # Validate it starts with frontmatter
     if not response.strip().startswith("---"):
@@ -338,38 +416,42 @@ tags: ""
 
 
 def step_reflect(config, topic_data, fetched_items, post_content, api_key, repo_root):
-    """Step 5: Reflect and update soul.json and memory.json."""
+    """Step 5: Reflect on the post. Returns the soul, memory and source updates to apply."""
     print("\n=== STEP 5: Reflecting ===")
     persona = config["persona"]
-    soul = config["soul"]
-    memory = config["memory"]
 
-    system = f"""You are the introspective mind of {persona.get('site_name', 'a blog')}.
+    # Only the soul/memory entries relevant to this post go in, so the prompt
+    # stays the same size however long memory grows
+    query = " ".join(str(topic_data.get(k, "")) for k in ("topic", "angle", "category")) + " " + post_content[:1000]
+    soul_view, memory_view = memory_for_prompt(repo_root, config, query, REFLECT_MEMORY_BUDGET)
+    system = system_blocks([persona_prefix(persona)], f"""Right now you are acting as the introspective mind of {persona.get('site_name', 'a blog')}.
 After each post, you reflect on what you learned and how you're evolving.
 You update your own soul (interests, opinions, style notes) and memory (findings, threads, connections).
+The soul and memory below show the entries most relevant to this post, not everything.
 
 Current soul state:
-{json.dumps(soul, indent=2)}
+{json.dumps(soul_view, indent=2)}
 
 Current memory state:
-{json.dumps(memory, indent=2)}"""
+{json.dumps(memory_view, indent=2)}""")
 
-    user = f"""I just wrote a post about: {topic_data.get('topic', '')}
+    def render(t):
+        return f"""I just wrote a post about: {topic_data.get('topic', '')}
 Category: {topic_data.get('category', '')}
 Angle: {topic_data.get('angle', '')}
 
 Post content (first 1000 chars):
-{post_content[:1000]}
+{t['post']}
 
 Items I reviewed this week (titles):
-{chr(10).join('- ' + item['title'][:80] for item in fetched_items[:20])}
+{t['items']}
 
 Reflect and return ONLY valid JSON with these exact keys:
 {{
     "soul_updates": {{
         "add_interests": ["new interests to explore, if any"],
         "remove_interests": ["interests that feel fully explored, if any"],
-        "add_opinions": [{{"topic": "...", "stance": "...", "since": "{datetime.now().strftime('%Y-%m-%d')}"}}],
+        "add_opinions": [{{"topic": "...", "stance": "...", "since": "{config['now'].strftime('%Y-%m-%d')}"}}],
         "update_opinions": [{{"topic": "existing topic", "new_stance": "evolved stance"}}],
         "add_exhausted": ["topics I've thoroughly covered"],
         "voice_notes": ["any new observations about what works in my writing"],
@@ -390,7 +472,11 @@ Reflect and return ONLY valid JSON with these exact keys:
 
 Only include updates that genuinely emerged from this week's work. Empty arrays are fine."""
 
-    response = call_claude(system, user, api_key, max_tokens=1500, temperature=0.7)
+    user = fit_prompt("reflect", system, render, [
+        Section("items", "\n".join('- ' + item['title'][:80] for item in fetched_items[:REFLECT_TOP_K]), priority=1),
+        Section("post", post_content[:1000], priority=2, trim="chars"),
+    ])
+    response = call_claude(system, user, api_key, max_tokens=1500, temperature=0.7, label="reflect", repo_root=repo_root)
 
     try:
         json_match = re.search(r'\{.*\}', response, re.DOTALL)
@@ -400,11 +486,28 @@ Only include updates that genuinely emerged from this week's work. Empty arrays
             updates = json.loads(response)
     except json.JSONDecodeError:
         print(f"  Warning: Could not parse reflection. Skipping updates.")
+        return {}
+    return updates
+
+
+def apply_reflection(repo_root, config, updates):
+    """Apply step_reflect's updates to soul.json, memory.json and sources.json.
+
+    The run id is committed in soul.json in the same batch as the updates, so a
+    resumed run whose reflection already reached disk does not apply it twice.
+    """
+    soul = config["soul"]
+    memory = config["memory"]
+    run_id = config["run"].run_id
+    if not updates:
+        return
+    if soul.get("last_reflection_run") == run_id:
+        print(f"  Reflection already applied in run {run_id}")
         return
 
     # Apply soul updates
     soul_updates = updates.get("soul_updates", {})
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = config["now"].strftime("%Y-%m-%d")
 
     for interest in soul_updates.get("add_interests", []):
         if interest and interest not in soul.get("current_interests", []):
@@ -435,18 +538,16 @@ Only include updates that genuinely emerged from this week's work. Empty arrays
         if thread in soul.get("threads_to_explore", []):
             soul["threads_to_explore"].remove(thread)
 
+    # Everything below is staged in the state store and written as one batch at the end
+    state = config["state"]
     soul["last_updated"] = today
-    save_json(os.path.join(repo_root, "config", "soul.json"), soul)
+    soul["last_reflection_run"] = run_id
+    state.mark_dirty("soul")
     print(f"  Soul updated: +{len(soul_updates.get('add_interests', []))} interests, "
           f"+{len(soul_updates.get('add_opinions', []))} opinions")
 
     # Log soul changes
-    soul_log_path = os.path.join(repo_root, "config", "soul_log.json")
-    soul_log = load_json(soul_log_path) if os.path.exists(soul_log_path) else []
-    if not isinstance(soul_log, list):
-        soul_log = []
-    soul_log.append({"date": today, "changes": soul_updates})
-    save_json(soul_log_path, soul_log[-50:])  # Keep last 50 entries
+    state.log("soul_log", {"date": today, "changes": soul_updates})
 
     # Apply memory updates
     mem_updates = updates.get("memory_updates", {})
@@ -473,16 +574,13 @@ Only include updates that genuinely emerged from this week's work. Empty arrays
                 thread["status"] = "completed"
                 thread["completed_date"] = today
 
-    save_json(os.path.join(repo_root, "config", "memory.json"), memory)
+    state.mark_dirty("memory")
     print(f"  Memory updated: +{len(mem_updates.get('key_findings', []))} findings, "
           f"+{len(mem_updates.get('follow_up_threads', []))} threads")
 
     # Apply source suggestions
     source_suggestions = updates.get("source_suggestions", {})
-    sources_log_path = os.path.join(repo_root, "config", "sources_log.json")
-    sources_log = load_json(sources_log_path) if os.path.exists(sources_log_path) else []
-    if not isinstance(sources_log, list):
-        sources_log = []
+    sources_log = []
 
     sources_config = config["sources"]
     source_list = sources_config.get("sources", []) if isinstance(sources_config, dict) else sources_config
@@ -511,166 +609,460 @@ Only include updates that genuinely emerged from this week's work. Empty arrays
 
     if isinstance(sources_config, dict):
         sources_config["sources"] = source_list
-    save_json(os.path.join(repo_root, "config", "sources.json"), sources_config)
-    save_json(sources_log_path, sources_log[-100:])
+    state.mark_dirty("sources")
+    state.log("sources_log", *sources_log)
+    commit_state(config)
+    memory_index.save_index(repo_root, soul, memory)
+
+
+# Sources in backoff already cost nothing per cycle; only give up on them for
+# good once the circuit has stayed open through several maxed-out windows.
+# With 1, 2, 4 and 4 cycles skipped between probes, the fifth straight failure
+# comes 16 cycles (about four months of weekly runs) after the first.
+DISABLE_AFTER_FAILURES = 5
+
+
+def commit_state(config):
+    """Commit the state store, noting its paths in the run manifest first for a resumed commit step."""
+    config["run"].add_paths(config["state"].pending_paths())
+    config["state"].commit()
+
+
+def source_health(repo_root, config):
+    """The cycle's SourceHealth, backed by the state store's source_health document."""
+    if "source_health" not in config:
+        records = config["state"].get("source_health")
+        if not isinstance(records, dict):
+            records = {}
+            config["state"].set("source_health", records)
+        config["source_health"] = SourceHealth(records)
+    return config["source_health"]
 
 
 def step_manage_sources(repo_root, config):
-    """Step 7: Auto-disable consistently failing sources."""
+    """Step 7: Report open circuits and auto-disable sources that never recover."""
     print("\n=== STEP 7: Source management ===")
     sources_config = config["sources"]
     source_list = sources_config.get("sources", []) if isinstance(sources_config, dict) else sources_config
+    health = source_health(repo_root, config)
     disabled = 0
+    changed = False
     for src in source_list:
-        failures = src.get("_consecutive_failures", 0)
-        if failures >= 3 and src.get("enabled", True):
+        key = source_key(src)
+        failures = health.consecutive_failures(key)
+        if failures >= DISABLE_AFTER_FAILURES and src.get("enabled", True):
             src["enabled"] = False
             print(f"  Auto-disabled {src.get('name', 'unknown')} after {failures} consecutive failures")
             disabled += 1
-        # Clean up internal tracking fields
-        src.pop("_last_success", None)
-        src.pop("_consecutive_failures", None)
-    if disabled:
-        save_json(os.path.join(repo_root, "config", "sources.json"), sources_config)
+            changed = True
+        elif failures and src.get("enabled", True):
+            record = health.get(key)
+            print(f"  {src.get('name', 'unknown')}: {failures} consecutive failures, "
+                  f"{record.get('state')}, {record.get('skip_cycles', 0)} cycles left to skip")
+        # Clean up legacy in-memory tracking fields
+        for field in ("_last_success", "_consecutive_failures"):
+            if field in src:
+                src.pop(field)
+                changed = True
+    if changed:
+        config["state"].mark_dirty("sources")
+        commit_state(config)
     print(f"  Sources managed ({disabled} disabled)")
 
 
-def step_build_and_commit(repo_root, dry_run=False, push=False):
-    """Step 8: Build site and commit all changes."""
+def _git(repo_root, *args, input=None, timings=None):
+    """Run one git command, timing it. Returns the CompletedProcess (or None if git is missing)."""
+    started = time.monotonic()
+    try:
+        with span(f"git {args[0]}", cat="git"):
+            result = subprocess.run(["git", *args], cwd=repo_root, capture_output=True, text=True, input=input)
+    except FileNotFoundError:
+        return None
+    elapsed = time.monotonic() - started
+    if timings is not None:
+        timings.append((args[0], elapsed))
+    return result
+
+
+def _check_git(result, ok=(0,)):
+    """Raise with git's own message when a git command failed."""
+    if result.returncode not in ok:
+        message = (result.stderr or result.stdout).strip()
+        print(f"  [git] {result.args[1]} failed (exit {result.returncode}): {message}")
+        raise RuntimeError(f"git {result.args[1]} failed: {message}")
+
+
+def step_build_and_commit(repo_root, dry_run=False, push=False, build=True, changed_paths=None):
+    """Step 8: Build site (unless already built) and commit the changed files.
+
+    changed_paths lists the repo-relative paths this cycle wrote; only those are
+    staged, so git never has to scan the whole generated site. None falls back
+    to staging everything with `git add -A`.
+    """
     print("\n=== STEP 8: Build & Commit ===")
-    build_site(repo_root)
+    if build:
+        built = build_site(repo_root)
+        if changed_paths is not None:
+            changed_paths = sorted(set(changed_paths) | set(built))
 
     if dry_run:
         print("  [DRY RUN] Skipping git commit")
         return
-
-    # Check if we're in a git repo
-    try:
-        subprocess.run(["git", "status"], cwd=repo_root, capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("  Not a git repo or git not available. Skipping commit.")
-        return
-
-    # Stage all changes
-    subprocess.run(["git", "add", "-A"], cwd=repo_root, capture_output=True)
-
-    # Check if there are changes to commit
-    result = subprocess.run(["git", "status", "--porcelain"], cwd=repo_root, capture_output=True, text=True)
-    if not result.stdout.strip():
+    if changed_paths is not None and not changed_paths:
         print("  No changes to commit")
         return
 
-    # Commit
-    today = datetime.now().strftime("%Y-%m-%d")
-    commit_msg = f"New post + soul/memory update ({today})"
-    subprocess.run(["git", "commit", "-m", commit_msg], cwd=repo_root, capture_output=True)
-    print(f"  Committed: {commit_msg}")
-
-    # Always push after commit
-    result = subprocess.run(["git", "push"], cwd=repo_root, capture_output=True, text=True)
-    if result.returncode == 0:
-        print("  Pushed to remote")
-    else:
-        print(f"  Push failed: {result.stderr.strip()}")
+    timings = []
+    try:
+        # Check if we're in a git repo
+        result = _git(repo_root, "rev-parse", "--git-dir", timings=timings)
+        if result is None or result.returncode != 0:
+            print("  Not a git repo or git not available. Skipping commit.")
+            return
+
+        if changed_paths is None:
+            _check_git(_git(repo_root, "add", "-A", timings=timings))
+        else:
+            # NUL-separated pathspecs on stdin. A path that matches nothing makes
+            # git add stage nothing at all, so removed paths go through git rm,
+            # which can skip the ones git never tracked.
+            present, removed = [], []
+            for path in changed_paths:
+                (present if os.path.lexists(os.path.join(repo_root, path)) else removed).append(path)
+            if present:
+                _check_git(_git(repo_root, "add", "--pathspec-from-file=-", "--pathspec-file-nul",
+                                input="\0".join(present), timings=timings))
+            if removed:
+                _check_git(_git(repo_root, "rm", "-q", "--cached", "--ignore-unmatch", "--pathspec-from-file=-",
+                                "--pathspec-file-nul", input="\0".join(removed), timings=timings))
+            print(f"  Staged {len(changed_paths)} changed paths")
+
+        staged = _git(repo_root, "diff", "--cached", "--quiet", timings=timings)
+        if staged.returncode == 0:
+            # Nothing staged differs from HEAD: no commit, so nothing to push either
+            print("  No changes to commit")
+            return
+        _check_git(staged, ok=(1,))
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        commit_msg = f"New post + soul/memory update ({today})"
+        _check_git(_git(repo_root, "commit", "-q", "-m", commit_msg, timings=timings))
+        print(f"  Committed: {commit_msg}")
+
+        # Always push after commit
+        result = _git(repo_root, "push", timings=timings)
+        if result.returncode == 0:
+            print("  Pushed to remote")
+        else:
+            print(f"  Push failed: {result.stderr.strip()}")
+    finally:
+        if timings:
+            print("  [git] " + ", ".join(f"{cmd} {secs:.2f}s" for cmd, secs in timings))
 
 
 # --- Main orchestrator ---
 
-def run_cycle(repo_root, api_key, dry_run=False, fetch_only=False, category=None, reflect_only=False, push=False):
-    """Run the full autonomous generation cycle."""
+def run_cycle(repo_root, api_key, dry_run=False, fetch_only=False, category=None, reflect_only=False, push=False,
+              fetch_budget=FETCH_BUDGET_SECONDS, max_age_hours=ITEM_MAX_AGE_HOURS, resume=None, state=None,
+              prefetched=None, replay=None):
+    """Run the full autonomous generation cycle.
+
+    Every step's output is checkpointed to the run directory; with resume=<run-id>
+    the steps that run already completed are skipped. With replay=<run-id> a
+    new run takes that run's clock, token calibration and fetched items, so
+    every prompt matches the recorded one and --llm-cache=replay can serve it
+    offline (from the repo state the recorded run started from). Per-call
+    token metrics go to calls.jsonl and a Chrome trace of the cycle
+    (chrome://tracing or ui.perfetto.dev) to trace.json in the run directory.
+    Returns the run id and per-step milliseconds.
+    """
+    tracing.start()
+    run = RunCheckpoint(repo_root, resume)
+    recorded = RunCheckpoint(repo_root, replay) if replay else None
+    calibration_path = tokens.default_calibration_path(repo_root)
+    tokens.estimator.load(calibration_path)
+    # Prompts carry the date and budgets depend on the calibration: pin both per run
+    # (whole seconds, so the clock a replay reads back ranks items identically)
+    inputs = (recorded or run).manifest
+    now = datetime.fromisoformat(inputs["clock"]) if "clock" in inputs else datetime.now().replace(microsecond=0)
+    tokens.estimator.pinned = inputs.get("chars_per_token") or tokens.estimator.chars_per_token
+    if not run.resumed:
+        run.record(clock=now.isoformat(timespec="seconds"), chars_per_token=tokens.estimator.pinned,
+                   replay_of=replay)
+    claude_client.CALL_LOG_PATH = os.path.join(run.path, "calls.jsonl")
+    first_call = len(claude_client.call_log)
     print(f"\n{'='*60}")
     print(f"  BLOG BOT GENERATION CYCLE")
     print(f"  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"  Repo: {repo_root}")
+    print(f"  Run: {run.run_id}{' (resumed)' if run.resumed else ''}{f' (replay of {replay})' if replay else ''}")
     print(f"{'='*60}")
-
+    events = []
+    try:
+        with span("run_cycle", run_id=run.run_id):
+            _run_steps(run, repo_root, api_key, dry_run, fetch_only, category, reflect_only, push,
+                       fetch_budget, max_age_hours, state, prefetched, now, recorded)
+    except BaseException:
+        print(f"\n  Cycle failed. Resume with: --resume {run.run_id}")
+        raise
+    finally:
+        claude_client.CALL_LOG_PATH = None
+        tokens.estimator.pinned = None
+        if recorded is None:
+            tokens.estimator.save(calibration_path)
+        _print_call_summary(claude_client.call_log[first_call:])
+        trace_path = os.path.join(run.path, "trace.json")
+        events = tracing.stop(trace_path)
+        tracing.summary(events)
+        print(f"  Trace: {trace_path}")
+    return {"run_id": run.run_id,
+            "steps_ms": {e["name"]: round(e["dur"] / 1000, 1) for e in events if e["cat"] == "step"}}
+
+
+def _print_call_summary(calls):
+    if not calls:
+        return
+    usage = [c.get("usage", {}) for c in calls]
+    total_in = sum(u.get("input_tokens", 0) + u.get("cache_read_input_tokens", 0)
+                   + u.get("cache_creation_input_tokens", 0) for u in usage)
+    total_out = sum(u.get("output_tokens", 0) for u in usage)
+    estimated = sum(c.get("estimated_input_tokens", 0) for c in calls)
+    print(f"  Claude calls: {len(calls)}, {total_in} in (estimated {estimated}) / {total_out} out tokens, "
+          f"{sum(c.get('latency', 0) for c in calls):.1f}s "
+          f"(calibrated at {tokens.estimator.chars_per_token:.2f} chars/token)")
+
+
+def _run_steps(run, repo_root, api_key, dry_run, fetch_only, category, reflect_only, push,
+               fetch_budget, max_age_hours, state=None, prefetched=None, now=None, recorded=None):
+    """The cycle's steps, each wrapped in a checkpoint."""
     # Step 1: Wake up
     print("\n=== STEP 1: Loading config ===")
-    config = load_all_config(repo_root)
+    with span("load_config"):
+        config = load_all_config(repo_root, state)
+    config["now"] = now or datetime.now()
+    config["run"] = run
     persona = config["persona"]
     print(f"  Bot: {persona.get('site_name', 'Unknown')}")
     print(f"  Interests: {', '.join(config['soul'].get('current_interests', []))[:100]}")
 
-    # Step 2: Fetch sources
-    fetched_items = step_fetch(repo_root, config)
+    # Step 2: Fetch sources (a replay reuses the recorded run's items instead)
+    if recorded is not None:
+        if not recorded.done("fetch"):
+            raise RuntimeError(f"Run {recorded.run_id} has no recorded fetch to replay")
+        print(f"\n=== STEP 2: Fetched items from run {recorded.run_id} ===")
+        fetched_items = run.step("fetch", lambda: recorded.load("fetch"))
+    else:
+        fetched_items = run.step("fetch", lambda: step_fetch(
+            repo_root, config, budget=fetch_budget, max_age_hours=max_age_hours, prefetched=prefetched))
 
     if fetch_only:
         print("\n[FETCH ONLY] Stopping here.")
-        print(f"Fetched {len(fetched_items)} items total.")
+        print(f"Fetched {len(fetched_items)} items total (saved to the item store).")
+        run.finish()
         return
 
-    existing_posts = get_existing_posts(repo_root)
+    with span("rank", items=len(fetched_items)):
+        fetched_items = step_rank(config, fetched_items)
+    with span("load_existing_posts"):
+        existing_posts = get_existing_posts(repo_root)
 
     if reflect_only:
         # Just do reflection with empty post
         print("\n[REFLECT ONLY] Running reflection step.")
-        step_reflect(config, {"topic": "reflection only"}, fetched_items, "", api_key, repo_root)
-        step_build_and_commit(repo_root, dry_run, push=push)
+        updates = step_reflect(config, {"topic": "reflection only"}, fetched_items, "", api_key, repo_root)
+        apply_reflection(repo_root, config, updates)
+        step_build_and_commit(repo_root, dry_run, push=push, changed_paths=sorted(config["state"].changed_paths))
+        run.finish()
         return
 
     # Step 3: Select topic
-    topic_data = step_select_topic(config, fetched_items, existing_posts, api_key)
+    def select():
+        topic = step_select_topic(config, fetched_items, existing_posts, api_key, repo_root)
+        # Override category if specified
+        if category:
+            topic["category"] = category
+        return topic
+    topic_data = run.step("topic", select)
+
+    # Step 4: Write and save post
+    def write():
+        filename, post_content = step_write_post(config, topic_data, fetched_items, api_key, repo_root)
+        posts_dir = os.path.join(repo_root, "content", "posts")
+        os.makedirs(posts_dir, exist_ok=True)
+        post_path = os.path.join(posts_dir, filename)
+        with open(post_path, "w", encoding="utf-8") as f:
+            f.write(post_content)
+        print(f"  Saved: {post_path}")
+        return {"filename": filename, "content": post_content, "post_count": len(existing_posts) + 1}
+    post = run.step("post", write)
+    filename, post_content = post["filename"], post["content"]
+
+    # Steps 5-8 as a DAG: reflection and the page build only need the post, so
+    # they overlap; the about page and source management follow reflection
+    # (they read the soul/health it writes); commit waits for everything.
+    def reflect():
+        # Only the model's answer is checkpointed; applying it is idempotent per
+        # run, so a crash on either side of the state commit resumes cleanly
+        updates = run.step("reflect", lambda: step_reflect(
+            config, topic_data, fetched_items, post_content, api_key, repo_root))
+        apply_reflection(repo_root, config, updates)
+        return updates
+
+    def pages():
+        print("\n=== Building pages ===")
+        built = build_pages(repo_root)
+        run.add_paths(built)
+        return built
+
+    def about(reflection):
+        # The about page is rebuilt on every build; every 4th post marks it as an update
+        post_count = post["post_count"]
+        if post_count % 4 == 1 or post_count <= 2:
+            print("\n=== STEP 6: Updating about page ===")
+        else:
+            print(f"\n=== STEP 6: Refreshing about page (post #{post_count}, "
+                  f"next update at #{post_count + (4 - post_count % 4)})")
+        about_built = build_about_page(repo_root)
+        run.add_paths(about_built)
+        return about_built
+
+    def manage_sources(reflection):
+        return run.step("manage_sources", lambda: step_manage_sources(repo_root, config) or {})
+
+    def commit(built, about_built, sources_managed):
+        # The manifest also holds what an interrupted earlier attempt of this run
+        # wrote, which a rebuild now finds unchanged and so does not report
+        changed = sorted(run.changed_paths | set(built) | set(about_built) | config["state"].changed_paths
+                         | {f"content/posts/{filename}"})
+        return run.step("build_commit", lambda: step_build_and_commit(
+            repo_root, dry_run, push=push, build=False, changed_paths=changed) or {})
+
+    timings = {}
+    run_dag([
+        Step("reflect", reflect, outputs=["reflection"], writes_state=True),
+        Step("pages", pages, outputs=["built"]),
+        Step("about", about, inputs=["reflection"], outputs=["about_built"]),
+        Step("manage_sources", manage_sources, inputs=["reflection"], outputs=["sources_managed"],
+             writes_state=True),
+        Step("commit", commit, inputs=["built", "about_built", "sources_managed"]),
+    ], timings=timings)
+    run.finish()
+    print("\n  Step timings: " + ", ".join(f"{name} {secs:.2f}s" for name, secs in timings.items()))
+
+    print(f"\n{'='*60}")
+    print(f"  CYCLE COMPLETE")
+    print(f"  Post: {filename}")
+    print(f"{'='*60}")
 
-    # Override category if specified
-    if category:
-        topic_data["category"] = category
 
-    # Step 4: Write post
-    filename, post_content = step_write_post(config, topic_data, fetched_items, api_key)
+# --- Daemon mode ---
 
-    # Save post
-    posts_dir = os.path.join(repo_root, "content", "posts")
-    os.makedirs(posts_dir, exist_ok=True)
-    post_path = os.path.join(posts_dir, filename)
-    with open(post_path, "w", encoding="utf-8") as f:
-        f.write(post_content)
-    print(f"  Saved: {post_path}")
-
-    # Step 5: Reflect
-    step_reflect(config, topic_data, fetched_items, post_content, api_key, repo_root)
-
-    # Step 6: Update about page (every 4th post)
-    post_count = len(existing_posts) + 1
-    if post_count % 4 == 1 or post_count <= 2:
-        print("\n=== STEP 6: Updating about page ===")
-        build_about_page(repo_root)
-    else:
-        print(f"\n=== STEP 6: Skipping about update (post #{post_count}, next at #{post_count + (4 - post_count % 4)})")
+DAEMON_SCHEDULE = "0 9 * * 1"  # Mondays at 9:00, as the Actions workflow used to run
+DAEMON_STATUS_PORT = 8787
 
-    # Step 7: Source management
-    step_manage_sources(repo_root, config)
 
-    # Step 8: Build and commit
-    step_build_and_commit(repo_root, dry_run, push=push)
+def run_daemon(repo_root, api_key, schedule=DAEMON_SCHEDULE, status_port=DAEMON_STATUS_PORT, run_now=False,
+               **cycle_args):
+    """Run cycles on a cron schedule in this process until SIGINT or SIGTERM.
 
-    print(f"\n{'='*60}")
-    print(f"  CYCLE COMPLETE")
-    print(f"  Post: {filename}")
-    print(f"{'='*60}")
+    Between cycles the process keeps the state store (soul, memory, sources
+    and source health; files edited by hand are reloaded), build.py's parsed posts
+    and the TLS context. Pooled HTTP connections would be stale by the next
+    cycle, so they are closed when each cycle ends. The item store and the novelty and memory indexes on
+    disk are incremental already, so each cycle only redoes what changed.
+    """
+    warm = {"state": None}
+
+    def cycle():
+        if warm["state"] is None:
+            warm["state"] = StateStore(repo_root)
+        try:
+            result = run_cycle(repo_root, api_key, state=warm["state"], **cycle_args)
+        except BaseException:
+            warm["state"] = None  # a failed cycle's uncommitted edits must not leak into the next one
+            raise
+        finally:
+            http_pool.pool.close()
+        result["connections"] = {"opened": http_pool.pool.opened, "reused": http_pool.pool.reused}
+        return result
+
+    daemon = Daemon(CronSchedule(schedule), cycle)
+    if status_port:
+        daemon.serve_status(status_port)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.run_forever(run_now=run_now)
+    except KeyboardInterrupt:
+        daemon.stop()
+    finally:
+        http_pool.pool.close()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Blog Bot Generation Cycle")
+    parser.add_argument("mode", nargs="?", choices=("cycle", "daemon"), default="cycle",
+                        help="Run one cycle (default), or keep running cycles on --schedule")
     parser.add_argument("--repo-root", default=None, help="Repository root path")
     parser.add_argument("--dry-run", action="store_true", help="Skip git commit/push")
     parser.add_argument("--fetch-only", action="store_true", help="Only fetch sources, don't generate")
     parser.add_argument("--category", type=str, help="Override category for this post")
     parser.add_argument("--reflect-only", action="store_true", help="Only run reflection step")
     parser.add_argument("--push", action="store_true", help="Push to remote after commit")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume an interrupted cycle, skipping the steps it completed")
+    parser.add_argument("--replay", metavar="RUN_ID",
+                        help="Re-run a recorded cycle offline: its date, calibration and fetched items, "
+                             "with Claude replies from the response cache (implies --llm-cache=replay)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream Claude API responses to disk as they are generated")
+    parser.add_argument("--llm-cache", choices=claude_client.LLM_CACHE_MODES, default=claude_client.LLM_CACHE_MODE,
+                        help="Claude response cache: record and reuse (readwrite), replay only, or off")
+    parser.add_argument("--fetch-budget", type=float, default=FETCH_BUDGET_SECONDS,
+                        help="Seconds allowed for the whole fetch stage (0 = no limit)")
+    parser.add_argument("--max-age", type=float, default=ITEM_MAX_AGE_HOURS,
+                        help="Reuse stored items for sources fetched within this many hours (0 = always refetch)")
+    parser.add_argument("--prompt-budget", action="append", default=[], metavar="STEP=TOKENS",
+                        help=f"Override a step's prompt token budget ({', '.join(PROMPT_BUDGETS)}); repeatable")
+    parser.add_argument("--schedule", default=DAEMON_SCHEDULE,
+                        help=f"Daemon: cron expression for cycle times, local time (default {DAEMON_SCHEDULE!r})")
+    parser.add_argument("--status-port", type=int, default=DAEMON_STATUS_PORT,
+                        help="Daemon: local port for the JSON status endpoint (0 = none)")
+    parser.add_argument("--run-now", action="store_true", help="Daemon: run a cycle at startup as well")
     args = parser.parse_args()
+    if args.mode == "daemon" and (args.resume or args.replay):
+        parser.error("--resume and --replay apply to a single cycle, not daemon mode")
+    if args.resume and args.replay:
+        parser.error("--resume and --replay are mutually exclusive")
+    try:
+        CronSchedule(args.schedule)
+    except ValueError as e:
+        parser.error(str(e))
+    for override in args.prompt_budget:
+        step, _, value = override.partition("=")
+        if step not in PROMPT_BUDGETS or not value.isdigit():
+            parser.error(f"--prompt-budget expects STEP=TOKENS with STEP one of {', '.join(PROMPT_BUDGETS)}")
+        PROMPT_BUDGETS[step] = int(value)
 
     repo_root = args.repo_root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     api_key = os.environ.get("ANTHROPIC_API_KEY", "")
+    if args.stream:
+        claude_client.CLAUDE_STREAM = True
+    claude_client.LLM_CACHE_MODE = "replay" if args.replay else args.llm_cache
 
-    run_cycle(
-        repo_root=repo_root,
-        api_key=api_key,
+    cycle_args = dict(
         dry_run=args.dry_run,
         fetch_only=args.fetch_only,
         category=args.category,
         reflect_only=args.reflect_only,
         push=args.push,
+        fetch_budget=args.fetch_budget or None,
+        max_age_hours=args.max_age,
     )
+    if args.mode == "daemon":
+        run_daemon(repo_root, api_key, schedule=args.schedule, status_port=args.status_port,
+                   run_now=args.run_now, **cycle_args)
+    else:
+        run_cycle(repo_root=repo_root, api_key=api_key, resume=args.resume, replay=args.replay, **cycle_args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Keep-alive HTTP(S) connections shared between requests.
+
+urllib opens a new TCP connection, and builds a new TLS context, for every
+request. urlopen() here keeps finished connections per host and hands them
+to the next request for that host, so the Hacker News item calls of one
+fetch or the Claude calls of one cycle share a handshake. Connections only
+live within a cycle (IDLE_SECONDS is far shorter than the time between
+cycles); in a long-running process (generate.py daemon) the TLS context is
+what carries over.
+
+Responses behave like urllib's: a context manager with read(), readline(),
+line iteration, .status and .headers. Error statuses raise HTTPError and
+GET redirects are followed. When a proxy is configured for the URL's
+scheme, the request goes through urllib unchanged.
+"""
+
+import http.client
+import ssl
+import threading
+import time
+import urllib.request
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+
+MAX_IDLE_PER_HOST = 4
+IDLE_SECONDS = 30  # servers drop idle keep-alive connections; older ones are closed, not reused
+MAX_REDIRECTS = 5
+REDIRECT_STATUS = {301, 302, 303, 307, 308}
+
+_ssl_lock = threading.Lock()
+_ssl_context = None
+
+
+def ssl_context():
+    """One default TLS context for the process (loading the CA bundle is not free)."""
+    global _ssl_context
+    with _ssl_lock:
+        if _ssl_context is None:
+            _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+
+class PooledResponse:
+    """An http.client response that gives its connection back to the pool once fully read."""
+
+    def __init__(self, pool, key, conn, resp, url):
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self.url = url
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = resp.headers
+
+    def getcode(self):
+        return self.status
+
+    def read(self, amt=None):
+        data = self._resp.read(amt)
+        if self._resp.isclosed():
+            self.close()
+        return data
+
+    def readline(self, limit=-1):
+        line = self._resp.readline(limit)
+        if not line:
+            self.close()
+        return line
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._resp.isclosed() and not self._resp.will_close:
+            self._pool._release(self._key, conn)
+        else:
+            # Unread body left on the socket: the connection can't carry another request
+            self._resp.close()
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """Idle keep-alive connections keyed by (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host=MAX_IDLE_PER_HOST, idle_seconds=IDLE_SECONDS):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_seconds = idle_seconds
+        self.opened = 0
+        self.reused = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, key, timeout):
+        """(connection, reused) for key: an idle one if still fresh, else a new one."""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, released = idle.pop()
+                if now - released <= self.idle_seconds:
+                    self.reused += 1
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._connect(key, timeout), False
+
+    def _connect(self, key, timeout):
+        with self._lock:
+            self.opened += 1
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=ssl_context())
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+    def _send(self, key, method, path, data, headers, timeout):
+        conn, reused = self._acquire(key, timeout)
+        for attempt in range(2):
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused or attempt:
+                    raise
+                # The server closed the idle connection before this request reached it: retry on a new one
+                conn = self._connect(key, timeout)
+            except http.client.HTTPException as e:
+                conn.close()
+                raise URLError(e)
+            except BaseException:
+                conn.close()
+                raise
+
+    def request(self, url, data=None, headers=None, timeout=15):
+        """GET (or POST, when data is given) url; returns a PooledResponse."""
+        method = "GET" if data is None else "POST"
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                raise URLError(f"unsupported URL {url!r}")
+            key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            conn, resp = self._send(key, method, path, data, headers, timeout)
+            response = PooledResponse(self, key, conn, resp, url)
+            location = resp.headers.get("Location")
+            if resp.status in REDIRECT_STATUS and method == "GET" and location:
+                response.read()
+                response.close()
+                url = urljoin(url, location)
+                continue
+            if resp.status >= 400:
+                raise HTTPError(url, resp.status, resp.reason, resp.headers, response)
+            return response
+        raise URLError(f"too many redirects for {url}")
+
+
+pool = ConnectionPool()
+
+
+def _proxied(url):
+    parts = urlsplit(url)
+    return parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def urlopen(url, data=None, headers=None, timeout=15):
+    """Open url over a pooled keep-alive connection (urllib when a proxy applies)."""
+    if _proxied(url):
+        req = urllib.request.Request(url, data=data, headers=headers or {})
+        return urllib.request.urlopen(req, timeout=timeout, context=ssl_context())
+    return pool.request(url, data=data, headers=headers, timeout=timeout)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Local store of fetched items, so reruns within a freshness window reuse them.
+
+SQLite via stdlib sqlite3, at .cache/items.sqlite3 under the repo root. Each
+source's latest fetch replaces its previous items; items are indexed by URL
+and by source key (see fetch_sources.source_key).
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source_key TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    item_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    source_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    source_name TEXT NOT NULL,
+    extra TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_source ON items (source_key, position);
+CREATE INDEX IF NOT EXISTS items_url ON items (url);
+"""
+
+CORE_FIELDS = ("title", "url", "snippet", "source_name")
+
+
+def default_store_path(repo_root):
+    return os.path.join(repo_root, ".cache", "items.sqlite3")
+
+
+class ItemStore:
+    """Fetched items per source with fetch timestamps."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def fetched_at(self, key):
+        """Unix time of the source's last stored fetch, or None."""
+        row = self.conn.execute(
+            "SELECT fetched_at FROM sources WHERE source_key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, key, max_age_hours, now=None):
+        fetched = self.fetched_at(key)
+        if fetched is None or not max_age_hours:
+            return False
+        return (now or time.time()) - fetched <= max_age_hours * 3600
+
+    def get_items(self, key):
+        """Stored items for a source, in fetch order, each with a "fetched_at"."""
+        rows = self.conn.execute(
+            "SELECT title, url, snippet, source_name, extra, fetched_at FROM items "
+            "WHERE source_key = ? ORDER BY position", (key,)).fetchall()
+        items = []
+        for title, url, snippet, source_name, extra, fetched_at in rows:
+            item = json.loads(extra) if extra else {}
+            item.update({"title": title, "url": url, "snippet": snippet,
+                         "source_name": source_name, "fetched_at": fetched_at})
+            items.append(item)
+        return items
+
+    def put_items(self, key, items, fetched_at=None):
+        """Replace a source's stored items with a fresh fetch."""
+        fetched_at = fetched_at or time.time()
+        rows = []
+        for position, item in enumerate(items):
+            extra = {k: v for k, v in item.items() if k not in CORE_FIELDS and k != "fetched_at"}
+            rows.append((key, position, item.get("url", ""), item.get("title", ""),
+                         item.get("snippet", ""), item.get("source_name", ""),
+                         json.dumps(extra, ensure_ascii=False) if extra else None, fetched_at))
+        with self.conn:
+            self.conn.execute("DELETE FROM items WHERE source_key = ?", (key,))
+            self.conn.executemany(
+                "INSERT INTO items (source_key, position, url, title, snippet, source_name, extra, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (source_key, fetched_at, item_count) VALUES (?, ?, ?)",
+                (key, fetched_at, len(items)))
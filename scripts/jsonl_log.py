@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Append-only JSON Lines logs with rotation into gzip archives.
+
+Appending writes one line and never rereads the log, so logging costs the
+same every cycle and git diffs show only the new lines. When the live file
+grows past max_bytes (or max_entries lines) it is compressed to
+<name>.<seq>-<timestamp>.jsonl.gz next to it and started afresh. tail(n)
+reads the last n entries from the end of the live file, falling back to the
+newest archives when the live file holds fewer.
+"""
+
+import glob
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime
+
+MAX_LOG_BYTES = 256 * 1024
+TAIL_BLOCK_SIZE = 8192
+
+
+class JsonlLog:
+    """One append-only log file plus its rotated archives."""
+
+    def __init__(self, path, max_bytes=MAX_LOG_BYTES, max_entries=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stem = path[:-len(".jsonl")] if path.endswith(".jsonl") else path
+
+    def append(self, *entries):
+        if not entries:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.maybe_rotate()
+
+    def maybe_rotate(self):
+        if os.path.exists(self.path) and self._should_rotate():
+            return self.rotate()
+        return None
+
+    def _should_rotate(self):
+        size = os.path.getsize(self.path)
+        if self.max_bytes and size > self.max_bytes:
+            return True
+        if self.max_entries:
+            # Bounded by max_bytes, so this stays a constant-size read
+            with open(self.path, "rb") as f:
+                return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(65536), b"")) > self.max_entries
+        return False
+
+    def archives(self):
+        """Archive paths, oldest first (zero-padded sequence numbers sort lexically)."""
+        return sorted(glob.glob(f"{glob.escape(self.stem)}.*.jsonl.gz"))
+
+    def rotate(self):
+        """Compress the live file into a new archive and truncate it."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        seq = len(self.archives()) + 1
+        archive = f"{self.stem}.{seq:04d}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+        with open(self.path, "rb") as src, gzip.open(archive, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        open(self.path, "w").close()
+        print(f"  [log] Rotated {os.path.basename(self.path)} into {os.path.basename(archive)}")
+        return archive
+
+    def _tail_lines(self, n):
+        """Last n non-empty lines of the live file, read backwards in blocks."""
+        if n <= 0 or not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        if pos > 0:
+            lines = lines[1:]  # first line may be partial
+        return lines[-n:]
+
+    def tail(self, n):
+        """Last n entries, oldest first."""
+        lines = self._tail_lines(n)
+        entries = [json.loads(line) for line in lines]
+        for archive in reversed(self.archives()):
+            if len(entries) >= n:
+                break
+            with gzip.open(archive, "rt", encoding="utf-8") as f:
+                older = [json.loads(line) for line in f if line.strip()]
+            entries = older[-(n - len(entries)):] + entries
+        return entries
+
+    def migrate_from_json(self, json_path):
+        """Move a legacy JSON-array log into this log (once), then delete it."""
+        if not os.path.exists(json_path):
+            return 0
+        with open(json_path, "r", encoding="utf-8") as f:
+            try:
+                entries = json.load(f)
+            except json.JSONDecodeError:
+                entries = []
+        if not isinstance(entries, list):
+            entries = []
+        self.append(*entries)
+        os.remove(json_path)
+        print(f"  [log] Migrated {len(entries)} entries from {os.path.basename(json_path)}")
+        return len(entries)
+
+
+def config_log(repo_root, name, **kwargs):
+    """config/<name>.jsonl, migrating a legacy config/<name>.json array if one is left."""
+    config_dir = os.path.join(repo_root, "config")
+    log = JsonlLog(os.path.join(config_dir, f"{name}.jsonl"), **kwargs)
+    log.migrate_from_json(os.path.join(config_dir, f"{name}.json"))
+    return log
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Retrieval index over soul.json and memory.json entries, for budgeted prompts.
+
+soul and memory lists grow every cycle, so prompts no longer paste them
+whole. Each list entry (an interest, opinion, finding, thread, connection...)
+becomes an index entry holding its term vector and rendered JSON, whose token
+cost is estimated at selection time with the calibrated estimator (tokens.py).
+The index is rebuilt whenever apply_reflection saves soul/memory and stored in
+.cache/memory_index.json with a fingerprint of the files it came from, so a
+hand edit of either file simply triggers a rebuild on next load.
+
+select() scores entries against a query text with TF-IDF cosine and takes
+the best ones until a token budget is spent; the chosen entries are handed
+back in their original shape (soul/memory dicts with filtered lists), so the
+prompts and the update logic keep working with exact entry strings.
+"""
+
+import hashlib
+import json
+import math
+import os
+
+from textvec import tokenize
+from tokens import estimate_tokens
+
+INDEX_VERSION = 3
+
+# (file, list key) pairs that are retrieved rather than always included.
+# Everything else in soul/memory (voice notes, favourite sources...) is small
+# and always goes into the prompt.
+RETRIEVABLE = {
+    "soul": ("current_interests", "threads_to_explore", "developing_opinions", "topics_exhausted"),
+    "memory": ("key_findings", "follow_up_threads", "cross_connections", "reader_questions"),
+}
+
+RECENCY_BONUS = 0.15  # share of the score given to the newest entries of each list
+
+
+def default_index_path(repo_root):
+    return os.path.join(repo_root, ".cache", "memory_index.json")
+
+
+def _fingerprint(soul, memory):
+    blob = json.dumps([soul, memory], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _entry_text(value):
+    """Text used for matching: string entries as-is, dict entries' string fields joined."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(str(v) for k, v in value.items()
+                        if isinstance(v, str) and k not in ("date", "since", "updated", "discovered",
+                                                            "completed_date", "status", "post", "from"))
+    return str(value)
+
+
+def _retrievable(kind, value):
+    # Completed follow-up threads stay in memory.json for the record but are never prompted
+    return not (kind == "follow_up_threads" and isinstance(value, dict) and value.get("status") != "pending")
+
+
+def build_index(soul, memory):
+    """Index dict: one entry per retrievable list item, with term counts and rendered text."""
+    entries = []
+    for source, data in (("soul", soul), ("memory", memory)):
+        for kind in RETRIEVABLE[source]:
+            values = data.get(kind, [])
+            if not isinstance(values, list):
+                continue
+            for pos, value in enumerate(values):
+                if not _retrievable(kind, value):
+                    continue
+                terms = {}
+                for tok in tokenize(_entry_text(value)):
+                    terms[tok] = terms.get(tok, 0) + 1
+                entries.append({
+                    "source": source, "kind": kind, "pos": pos,
+                    "recency": (pos + 1) / len(values),
+                    "text": json.dumps(value, ensure_ascii=False),
+                    "terms": terms,
+                })
+    return {"version": INDEX_VERSION, "fingerprint": _fingerprint(soul, memory), "entries": entries}
+
+
+def save_index(repo_root, soul, memory):
+    """Rebuild and store the index; called right after soul/memory are saved."""
+    index = build_index(soul, memory)
+    path = default_index_path(repo_root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return index
+
+
+def load_index(repo_root, soul, memory):
+    """Stored index if it matches the current soul/memory, else a freshly saved one."""
+    path = default_index_path(repo_root)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION and index.get("fingerprint") == _fingerprint(soul, memory):
+            return index
+    except (OSError, json.JSONDecodeError):
+        pass
+    return save_index(repo_root, soul, memory)
+
+
+def _score(index, query_text, kinds):
+    entries = [e for e in index["entries"] if e["kind"] in kinds]
+    df = {}
+    for e in entries:
+        for tok in e["terms"]:
+            df[tok] = df.get(tok, 0) + 1
+    n = len(entries)
+    idf = {tok: math.log(1.0 + n / c) for tok, c in df.items()}
+
+    query = {}
+    for tok in tokenize(query_text):
+        if tok in idf:
+            query[tok] = query.get(tok, 0) + 1
+    q_vec = {tok: (1 + math.log(c)) * idf[tok] for tok, c in query.items()}
+    q_norm = math.sqrt(sum(w * w for w in q_vec.values())) or 1.0
+
+    scored = []
+    for e in entries:
+        vec = {tok: (1 + math.log(c)) * idf[tok] for tok, c in e["terms"].items()}
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        cosine = sum(w * vec.get(tok, 0.0) for tok, w in q_vec.items()) / (q_norm * norm)
+        scored.append(((1 - RECENCY_BONUS) * cosine + RECENCY_BONUS * e["recency"], e))
+    scored.sort(key=lambda pair: (-pair[0], -pair[1]["recency"]))
+    return scored
+
+
+def select(index, soul, memory, query_text, budget, kinds=None, label="memory"):
+    """Pick the entries most relevant to query_text within `budget` tokens.
+
+    Returns (soul_view, memory_view): copies of soul and memory whose
+    retrievable lists hold only the chosen entries, in their original order.
+    The budget and the selection are logged.
+    """
+    kinds = set(kinds or (RETRIEVABLE["soul"] + RETRIEVABLE["memory"]))
+    scored = _score(index, query_text, kinds)
+    chosen = {}
+    spent = 0
+    for _, e in scored:
+        cost = estimate_tokens(e["text"])
+        if spent + cost > budget:
+            continue  # a smaller entry further down may still fit
+        spent += cost
+        chosen.setdefault((e["source"], e["kind"]), set()).add(e["pos"])
+
+    views = {}
+    for source, data in (("soul", soul), ("memory", memory)):
+        view = {k: v for k, v in data.items() if k not in RETRIEVABLE[source]}
+        for kind in RETRIEVABLE[source]:
+            if kind in kinds and isinstance(data.get(kind), list):
+                picked = chosen.get((source, kind), set())
+                view[kind] = [v for pos, v in enumerate(data[kind]) if pos in picked]
+        views[source] = view
+
+    counts = ", ".join(f"{kind} {len(pos)}" for (_, kind), pos in sorted(chosen.items())) or "none"
+    print(f"  [{label}] {sum(len(p) for p in chosen.values())}/{len(scored)} entries, "
+          f"{spent}/{budget} tokens ({counts})")
+    return views["soul"], views["memory"]
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Generation cycles for several sites with one shared fetch.
+
+    python scripts/multi_site.py ../site-a ../site-b --dry-run
+
+Each site is a repo root with its own persona, soul, memory and sources.json.
+Their enabled sources are deduplicated by source_key, and every source that
+at least one site needs from the network (not fresh in its item store, not
+backing off) is fetched once. The per-site cycles then run concurrently and
+take their sources from that shared result, so fetch traffic grows with the
+number of unique sources rather than with sites times sources. Each site
+still records the outcome in its own item store and source health.
+
+The cycles run in spawned worker processes, because tracing, the Claude call
+log and the token calibration are process-wide and sites sharing a process
+would mix them. Each site's output is printed as one block when its cycle ends.
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+import claude_client
+import generate
+from fetch_sources import fetch_each, source_key, source_limit
+from item_store import ItemStore, default_store_path
+from source_health import SourceHealth
+from state_store import StateStore
+
+# A source listed by several sites is fetched once with the largest of these
+# and the largest limit; each site then cuts the items back to its own limit
+# (see fetch_all_sources)
+MERGED_FIELDS = ("max_bytes", "priority")
+
+
+def _enabled_sources(state):
+    sources = state.get("sources")
+    source_list = sources.get("sources", []) if isinstance(sources, dict) else sources
+    return [s for s in source_list if s.get("enabled", True)]
+
+
+def plan_shared_fetch(repo_roots, max_age_hours):
+    """({source_key: source} for sources some site needs from the network, total source entries)."""
+    needed = {}
+    entries = 0
+    for repo_root in repo_roots:
+        state = StateStore(repo_root)
+        records = state.get("source_health")
+        health = SourceHealth(records if isinstance(records, dict) else {})
+        store = ItemStore(default_store_path(repo_root))
+        try:
+            for source in _enabled_sources(state):
+                entries += 1
+                key = source_key(source)
+                if store.is_fresh(key, max_age_hours) or not health.should_fetch(key)[0]:
+                    continue
+                merged = needed.setdefault(key, dict(source))
+                for field in MERGED_FIELDS:
+                    if field in source:
+                        merged[field] = max(merged.get(field, source[field]), source[field])
+                # A site relying on the type's default limit still needs that many
+                if source_limit(source) is not None:
+                    merged["limit"] = max(source_limit(merged), source_limit(source))
+        finally:
+            store.close()
+    return needed, entries
+
+
+def shared_fetch(repo_roots, budget=None, max_age_hours=None):
+    """Fetch each source the sites need once. Returns fetch_each results for fetch_all_sources(prefetched=...)."""
+    needed, entries = plan_shared_fetch(repo_roots, max_age_hours)
+    print(f"\n=== Shared fetch: {len(needed)} unique sources for {len(repo_roots)} sites "
+          f"({entries} source entries) ===")
+    started = time.monotonic()
+    results = fetch_each(sorted(needed.values(), key=lambda s: -s.get("priority", 0)), budget)
+    fetched = [r for r in results.values() if r is not None and r[2] is None]
+    print(f"  Fetched {len(fetched)}/{len(needed)} sources, {sum(len(r[0]) for r in fetched)} items "
+          f"({time.monotonic() - started:.1f}s)")
+    # Errors go to worker processes as text
+    return {key: None if r is None else (r[0], r[1], None if r[2] is None else str(r[2]))
+            for key, r in results.items()}
+
+
+def _run_site(repo_root, api_key, prefetched, settings, cycle_args):
+    """One site's cycle in a worker process. Returns (output, result, error)."""
+    for name, value in settings["claude_client"].items():
+        setattr(claude_client, name, value)
+    generate.PROMPT_BUDGETS.update(settings["prompt_budgets"])
+    out = io.StringIO()
+    result, error = None, None
+    with contextlib.redirect_stdout(out):
+        try:
+            result = generate.run_cycle(repo_root, api_key, prefetched=prefetched, **cycle_args)
+        except Exception as e:
+            traceback.print_exc(file=out)
+            error = f"{type(e).__name__}: {e}"
+    return out.getvalue(), result, error
+
+
+def run_sites(repo_roots, api_key, workers=None, **cycle_args):
+    """Run one cycle per site after a shared fetch. Returns {repo_root: result or error string}."""
+    repo_roots = list(dict.fromkeys(os.path.abspath(r) for r in repo_roots))
+    prefetched = shared_fetch(repo_roots, cycle_args.get("fetch_budget"),
+                              cycle_args.get("max_age_hours", generate.ITEM_MAX_AGE_HOURS))
+    settings = {
+        "claude_client": {name: getattr(claude_client, name)
+                          for name in ("CLAUDE_API_URL", "CLAUDE_STREAM", "LLM_CACHE_MODE")},
+        "prompt_budgets": dict(generate.PROMPT_BUDGETS),
+    }
+    outcomes = {}
+    # Spawned, not forked: fetch threads cut off by the budget may still be
+    # running and holding http_pool or ssl locks, which a forked child would inherit
+    with ProcessPoolExecutor(max_workers=workers or len(repo_roots),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(_run_site, root, api_key, prefetched, settings, cycle_args): root
+                   for root in repo_roots}
+        for future in as_completed(futures):
+            root = futures[future]
+            try:
+                output, result, error = future.result()
+            except Exception as e:  # the worker process itself died
+                output, result, error = "", None, f"{type(e).__name__}: {e}"
+            print(f"\n{'#'*60}\n  SITE {root}\n{'#'*60}{output}")
+            outcomes[root] = result if error is None else error
+
+    print(f"\n{'='*60}")
+    print(f"  {len(repo_roots)} SITES DONE")
+    for root in repo_roots:
+        outcome = outcomes[root]
+        print(f"  {root}: {outcome['run_id'] if isinstance(outcome, dict) else f'FAILED ({outcome})'}")
+    print(f"{'='*60}")
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blog Bot cycles for several sites with a shared fetch")
+    parser.add_argument("repo_roots", nargs="+", help="Repository roots of the sites")
+    parser.add_argument("--dry-run", action="store_true", help="Skip git commit/push")
+    parser.add_argument("--push", action="store_true", help="Push to remote after commit")
+    parser.add_argument("--workers", type=int, default=None, help="Sites run at once (default: all)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream Claude API responses to disk as they are generated")
+    parser.add_argument("--llm-cache", choices=claude_client.LLM_CACHE_MODES, default=claude_client.LLM_CACHE_MODE,
+                        help="Claude response cache: record and reuse (readwrite), replay only, or off")
+    parser.add_argument("--fetch-budget", type=float, default=generate.FETCH_BUDGET_SECONDS,
+                        help="Seconds allowed for the shared fetch (0 = no limit)")
+    parser.add_argument("--max-age", type=float, default=generate.ITEM_MAX_AGE_HOURS,
+                        help="Reuse stored items for sources fetched within this many hours (0 = always refetch)")
+    args = parser.parse_args()
+
+    if args.stream:
+        claude_client.CLAUDE_STREAM = True
+    claude_client.LLM_CACHE_MODE = args.llm_cache
+    outcomes = run_sites(args.repo_roots, os.environ.get("ANTHROPIC_API_KEY", ""), workers=args.workers,
+                         dry_run=args.dry_run, push=args.push, fetch_budget=args.fetch_budget or None,
+                         max_age_hours=args.max_age)
+    sys.exit(0 if all(isinstance(o, dict) for o in outcomes.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
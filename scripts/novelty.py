@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Topic-novelty index over the whole post archive.
+
+Every post in content/posts is stored as two term vectors: a "head" built from
+its title, tags and excerpt (weighted in that order) and a "body" from the
+markdown text. The index lives in .cache/novelty_index.json and is refreshed
+incrementally: only posts whose file size or mtime changed are re-read.
+
+nearest() scores a candidate topic against every post with TF-IDF cosine
+(head and body blended), so step_select_topic can catch a near-duplicate
+before the long-form writing call is spent on it.
+"""
+
+import json
+import math
+import os
+
+from textvec import tokenize
+
+INDEX_VERSION = 2
+
+TITLE_WEIGHT = 3.0
+TAGS_WEIGHT = 2.0
+EXCERPT_WEIGHT = 1.5
+HEAD_SHARE = 0.7  # share of the similarity score taken from the head vector
+NOVELTY_THRESHOLD = 0.3  # topics at or above this similarity to a post count as repeats (known repeats: 0.37+)
+
+
+def default_index_path(repo_root):
+    return os.path.join(repo_root, ".cache", "novelty_index.json")
+
+
+def parse_post(text):
+    """(frontmatter dict, body) of a markdown post."""
+    meta = {}
+    body = text
+    if text.startswith("---"):
+        end = text.find("---", 3)
+        if end != -1:
+            for line in text[3:end].strip().split("\n"):
+                if ":" in line:
+                    k, v = line.split(":", 1)
+                    meta[k.strip()] = v.strip().strip('"').strip("'")
+            body = text[end + 3:]
+    return meta, body
+
+
+def _add_terms(terms, text, weight):
+    for tok in tokenize(text):
+        terms[tok] = terms.get(tok, 0.0) + weight
+
+
+def post_vectors(meta, body):
+    head = {}
+    _add_terms(head, meta.get("title", ""), TITLE_WEIGHT)
+    _add_terms(head, meta.get("tags", "").replace(",", " "), TAGS_WEIGHT)
+    _add_terms(head, meta.get("excerpt", ""), EXCERPT_WEIGHT)
+    body_terms = {}
+    _add_terms(body_terms, body, 1.0)
+    return head, body_terms
+
+
+class NoveltyIndex:
+    """Persisted per-post term vectors, refreshed from the posts directory."""
+
+    def __init__(self, path, posts=None):
+        self.path = path
+        self.posts = posts or {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                return cls(path, data.get("posts", {}))
+        except (OSError, json.JSONDecodeError):
+            pass
+        return cls(path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "posts": self.posts}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def refresh(self, posts_dir):
+        """Re-index new or changed posts and drop deleted ones. Returns the number re-indexed."""
+        seen = set()
+        changed = 0
+        names = sorted(os.listdir(posts_dir)) if os.path.isdir(posts_dir) else []
+        for fname in names:
+            if not fname.endswith(".md"):
+                continue
+            seen.add(fname)
+            st = os.stat(os.path.join(posts_dir, fname))
+            entry = self.posts.get(fname)
+            if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+                continue
+            with open(os.path.join(posts_dir, fname), "r", encoding="utf-8") as f:
+                meta, body = parse_post(f.read())
+            head, body_terms = post_vectors(meta, body)
+            self.posts[fname] = {"mtime": st.st_mtime, "size": st.st_size,
+                                 "title": meta.get("title", fname), "date": meta.get("date", ""),
+                                 "excerpt": meta.get("excerpt", ""), "head": head, "body": body_terms}
+            changed += 1
+        removed = [fname for fname in self.posts if fname not in seen]
+        for fname in removed:
+            del self.posts[fname]
+        if changed or removed:
+            self.save()
+        return changed
+
+    def _idf(self, field):
+        df = {}
+        for post in self.posts.values():
+            for tok in post[field]:
+                df[tok] = df.get(tok, 0) + 1
+        n = len(self.posts)
+        return {tok: math.log(1.0 + n / c) for tok, c in df.items()}
+
+    def nearest(self, text, k=3):
+        """[(similarity, {file, title, date, excerpt})] for the k posts closest to text, best first."""
+        query = {}
+        _add_terms(query, text, 1.0)
+        if not query or not self.posts:
+            return []
+        scores = {fname: 0.0 for fname in self.posts}
+        for field, share in (("head", HEAD_SHARE), ("body", 1.0 - HEAD_SHARE)):
+            idf = self._idf(field)
+            q_vec = {tok: (1 + math.log(w)) * idf[tok] for tok, w in query.items() if tok in idf}
+            q_norm = math.sqrt(sum(w * w for w in q_vec.values()))
+            if not q_norm:
+                continue
+            for fname, post in self.posts.items():
+                vec = post[field]
+                norm = math.sqrt(sum(((1 + math.log(w)) * idf[tok]) ** 2 for tok, w in vec.items())) or 1.0
+                dot = sum(w * (1 + math.log(vec[tok])) * idf[tok] for tok, w in q_vec.items() if tok in vec)
+                scores[fname] += share * dot / (q_norm * norm)
+        best = sorted(scores.items(), key=lambda pair: -pair[1])[:k]
+        return [(round(score, 3), {"file": fname, "title": self.posts[fname]["title"],
+                                   "date": self.posts[fname]["date"], "excerpt": self.posts[fname]["excerpt"]})
+                for fname, score in best]
+
+
+def load_index(repo_root):
+    """Novelty index brought up to date with content/posts."""
+    index = NoveltyIndex.load(default_index_path(repo_root))
+    index.refresh(os.path.join(repo_root, "content", "posts"))
+    return index
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Local relevance ranking of fetched items against the bot's soul and memory.
+
+Items are scored as sparse term vectors against a query built from
+soul.json current_interests and threads_to_explore plus pending memory.json
+follow_up_threads, with BM25-style term saturation and IDF computed over the
+whole item set. Scores go through an inverted index, so only postings of
+query terms are touched. Items close to topics_exhausted are penalised,
+older items decay, items seen through several sources get a boost, and the
+final order is picked greedily with a per-source decay so one feed cannot
+fill the top of the list.
+"""
+
+import heapq
+import math
+import time
+
+from textvec import tokenize
+
+TITLE_WEIGHT = 2.0
+TF_SATURATION = 1.2
+FOLLOW_UP_WEIGHT = 0.8
+EXHAUSTED_PENALTY = 1.5
+FRESHNESS_HALF_LIFE_HOURS = 72
+MULTI_SOURCE_BONUS = 0.25
+DIVERSITY_DECAY = 0.7
+BASE_SCORE = 0.05
+
+
+def _phrase_weights(phrases, weight):
+    """Term weights for a list of phrases; each phrase carries `weight` in total."""
+    terms = {}
+    for phrase in phrases:
+        tokens = set(tokenize(phrase))
+        if not tokens:
+            continue
+        share = weight / math.sqrt(len(tokens))
+        for tok in tokens:
+            terms[tok] = terms.get(tok, 0.0) + share
+    return terms
+
+
+def build_query(soul, memory):
+    """(positive term weights, exhausted term weights) from soul and memory."""
+    query = _phrase_weights(soul.get("current_interests", []), 1.0)
+    for tok, w in _phrase_weights(soul.get("threads_to_explore", []), 1.0).items():
+        query[tok] = query.get(tok, 0.0) + w
+    pending = [t.get("thread", "") for t in memory.get("follow_up_threads", [])
+               if isinstance(t, dict) and t.get("status") == "pending"]
+    for tok, w in _phrase_weights(pending, FOLLOW_UP_WEIGHT).items():
+        query[tok] = query.get(tok, 0.0) + w
+    exhausted = _phrase_weights(soul.get("topics_exhausted", []), 1.0)
+    return query, exhausted
+
+
+def score_items(items, soul, memory, now=None):
+    """Relevance score per item (same order as `items`)."""
+    now = now or time.time()
+    query, exhausted = build_query(soul, memory)
+
+    # Inverted index: term -> [(item index, saturated term frequency)]
+    postings = {}
+    for i, item in enumerate(items):
+        tf = {}
+        for tok in tokenize(item.get("title", "")):
+            tf[tok] = tf.get(tok, 0.0) + TITLE_WEIGHT
+        if item.get("snippet") != item.get("title"):
+            for tok in tokenize(item.get("snippet", "")):
+                tf[tok] = tf.get(tok, 0.0) + 1.0
+        for tok, f in tf.items():
+            postings.setdefault(tok, []).append((i, f / (f + TF_SATURATION)))
+
+    n = len(items)
+    relevance = [0.0] * n
+    penalty = [0.0] * n
+    for terms, scores in ((query, relevance), (exhausted, penalty)):
+        for tok, qw in terms.items():
+            plist = postings.get(tok)
+            if not plist:
+                continue
+            idf = math.log(1.0 + n / len(plist))
+            for i, f in plist:
+                scores[i] += qw * idf * f
+
+    results = []
+    for i, item in enumerate(items):
+        fetched = item.get("fetched_at") or now
+        age_hours = max(0.0, (now - fetched) / 3600)
+        freshness = 0.5 ** (age_hours / FRESHNESS_HALF_LIFE_HOURS)
+        sources = len(item.get("source_names") or [item.get("source_name")])
+        score = BASE_SCORE + max(0.0, relevance[i] - EXHAUSTED_PENALTY * penalty[i])
+        score *= (0.7 + 0.3 * freshness) * (1.0 + MULTI_SOURCE_BONUS * math.log2(sources))
+        results.append(score)
+    return results
+
+
+def rank_items(items, soul, memory, now=None):
+    """Return `items` ordered by relevance with source diversity applied.
+
+    Each item also gets its score as "rank_score". Greedy selection: the
+    next pick is the best item after decaying each source's remaining items
+    by DIVERSITY_DECAY per item already picked from that source.
+    """
+    scores = score_items(items, soul, memory, now)
+    by_source = {}
+    for i, item in enumerate(items):
+        item["rank_score"] = round(scores[i], 4)
+        by_source.setdefault(item.get("source_name", ""), []).append(i)
+    for queue in by_source.values():
+        queue.sort(key=lambda i: (scores[i], -i))  # best item last, for cheap pops
+
+    # Heap over sources keyed by their best remaining item's decayed score
+    picked = {name: 0 for name in by_source}
+    heap = [(-scores[q[-1]], q[-1], name) for name, q in by_source.items()]
+    heapq.heapify(heap)
+    ranked = []
+    while heap:
+        _, _, name = heapq.heappop(heap)
+        queue = by_source[name]
+        ranked.append(items[queue.pop()])
+        picked[name] += 1
+        if queue:
+            decayed = scores[queue[-1]] * DIVERSITY_DECAY ** picked[name]
+            heapq.heappush(heap, (-decayed, queue[-1], name))
+    return ranked
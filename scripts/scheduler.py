@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tiny dependency-aware step scheduler for the generation cycle.
+
+Each Step names the values it needs (inputs) and the values it produces
+(outputs). run_dag starts every step whose inputs are available on a thread
+pool, so independent steps overlap and the cycle takes as long as its
+critical path. Steps flagged writes_state run under one shared lock, which
+keeps writes to the config/state files serialised.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from tracing import span
+
+
+class Step:
+    """A named unit of work: fn(**inputs) -> output value (or dict for several outputs)."""
+
+    def __init__(self, name, fn, inputs=(), outputs=(), writes_state=False):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.writes_state = writes_state
+
+
+def _execute(step, kwargs, state_lock):
+    started = time.monotonic()
+    with span(f"dag:{step.name}", cat="dag"):
+        if step.writes_state:
+            with state_lock:
+                result = step.fn(**kwargs)
+        else:
+            result = step.fn(**kwargs)
+    return result, time.monotonic() - started
+
+
+def _outputs(step, result):
+    if not step.outputs:
+        return {}
+    if len(step.outputs) == 1:
+        return {step.outputs[0]: result}
+    return {name: result[name] for name in step.outputs}
+
+
+def run_dag(steps, values=None, workers=4, timings=None):
+    """Run steps in dependency order, concurrently where possible.
+
+    `values` seeds the available inputs; the returned dict adds every step's
+    outputs. Per-step durations are stored in `timings` if given. The first
+    failing step's exception is re-raised once running steps have finished;
+    steps that had not started yet are not run.
+    """
+    values = dict(values or {})
+    producers = {out: step.name for step in steps for out in step.outputs}
+    for step in steps:
+        missing = [i for i in step.inputs if i not in values and i not in producers]
+        if missing:
+            raise ValueError(f"Step {step.name} needs {missing}, which nothing produces")
+
+    state_lock = threading.Lock()
+    pending = list(steps)
+    running = {}
+    error = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while (pending and error is None) or running:
+            if error is None:
+                ready = [s for s in pending if all(i in values for i in s.inputs)]
+                for step in ready:
+                    pending.remove(step)
+                    kwargs = {name: values[name] for name in step.inputs}
+                    ctx = contextvars.copy_context()
+                    running[pool.submit(ctx.run, _execute, step, kwargs, state_lock)] = step
+            if not running:
+                raise RuntimeError(f"Steps can never run: {[s.name for s in pending]}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    result, elapsed = future.result()
+                except BaseException as e:
+                    error = error or e
+                    continue
+                if timings is not None:
+                    timings[step.name] = round(elapsed, 3)
+                values.update(_outputs(step, result))
+    if error is not None:
+        raise error
+    return values
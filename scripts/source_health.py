@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Persistent per-source health: failure counts, latency and backoff windows.
+
+State lives in config/source_health.json, keyed by source key (see
+fetch_sources.source_key), so it survives between cycles and CI runs. The
+file is read and written through state_store.StateStore.
+
+Each source is a small circuit breaker:
+  closed     fetched every cycle
+  open       failed recently; skipped without a network call for a number
+             of cycles (doubling per consecutive failure)
+  half_open  skipped its cycles; this cycle makes one probe fetch, which
+             closes the circuit on success or reopens it with a longer window
+
+Backoff is counted in cycles rather than hours: cycles run a week apart, so
+any window in hours short enough to be useful would expire before the next
+cycle and never skip anything.
+"""
+
+from datetime import datetime, timezone
+
+BACKOFF_BASE_CYCLES = 1
+BACKOFF_MAX_CYCLES = 4
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def backoff_cycles(failures):
+    """Cycles to skip after `failures` consecutive failures."""
+    if failures <= 0:
+        return 0
+    return min(BACKOFF_BASE_CYCLES * 2 ** (failures - 1), BACKOFF_MAX_CYCLES)
+
+
+class SourceHealth:
+    """Health records for all sources, keyed by source key.
+
+    The records dict is the state store's source_health document, which
+    also persists it; this class only reads and updates it.
+    """
+
+    def __init__(self, records=None):
+        self.records = records if records is not None else {}
+
+    def get(self, key):
+        return self.records.setdefault(key, {
+            "state": "closed",
+            "consecutive_failures": 0,
+            "last_latency": None,
+            "last_success": None,
+            "last_failure": None,
+            "last_error": None,
+            "skip_cycles": 0,
+        })
+
+    def consecutive_failures(self, key):
+        return self.records.get(key, {}).get("consecutive_failures", 0)
+
+    def should_fetch(self, key):
+        """Return (fetch?, reason). Moves open circuits with no cycles left to skip to half_open."""
+        record = self.records.get(key)
+        if not record or record.get("state") == "closed":
+            return True, "closed"
+        remaining = record.get("skip_cycles", 0)
+        if remaining > 0:
+            return False, f"backing off, {remaining} more cycle{'s' if remaining > 1 else ''}"
+        record["state"] = "half_open"
+        return True, "half-open probe"
+
+    def record_skip(self, key):
+        """Count a cycle the source sat out because should_fetch said no."""
+        record = self.get(key)
+        record["skip_cycles"] = max(record.get("skip_cycles", 0) - 1, 0)
+
+    def record_success(self, key, latency, now=None):
+        record = self.get(key)
+        record.pop("backoff_until", None)
+        record.update({
+            "state": "closed",
+            "consecutive_failures": 0,
+            "last_latency": round(latency, 3),
+            "last_success": (now or _now()).isoformat(timespec="seconds"),
+            "skip_cycles": 0,
+        })
+
+    def record_failure(self, key, latency, error="", now=None):
+        now = now or _now()
+        record = self.get(key)
+        record.pop("backoff_until", None)
+        failures = record.get("consecutive_failures", 0) + 1
+        record.update({
+            "state": "open",
+            "consecutive_failures": failures,
+            "last_latency": round(latency, 3),
+            "last_failure": now.isoformat(timespec="seconds"),
+            "last_error": str(error)[:200],
+            "skip_cycles": backoff_cycles(failures),
+        })
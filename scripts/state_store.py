@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Transactional store for the bot's state files in config/.
+
+Documents (soul, memory, sources, source_health, ...) are read once per
+cycle and handed out as mutable objects; steps mark the ones they changed as
+dirty and queue log entries. commit() then writes every change as one batch:
+
+1. each dirty document is serialised once to <name>.json.tmp and fsynced,
+2. a journal listing the renames and log appends is written and fsynced,
+3. the temp files are renamed over the originals and the log lines appended,
+4. the journal is removed.
+
+A crash before step 2 leaves only stray .tmp files, which are discarded on
+the next open; a crash after it is rolled forward from the journal. Either
+way the state files always match one committed batch. The files stay the
+plain pretty-printed JSON that is committed to git, so export() only needs
+to copy documents somewhere else.
+
+A long-lived store (generate.py daemon) calls refresh() at the start of each
+cycle, which drops clean documents whose file changed on disk since they
+were read or written, so hand edits are picked up instead of overwritten.
+"""
+
+import json
+import os
+import threading
+
+from jsonl_log import config_log
+
+JOURNAL_NAME = ".state-journal.json"
+SORTED_DOCUMENTS = {"source_health"}  # written with sort_keys, as source_health.json always has been
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # not supported on Windows; renames there are durable enough
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_synced(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class StateStore:
+    """config/*.json documents and config/*.jsonl logs, committed atomically together."""
+
+    def __init__(self, repo_root):
+        self.repo_root = repo_root
+        self.config_dir = os.path.join(repo_root, "config")
+        self.journal_path = os.path.join(self.config_dir, JOURNAL_NAME)
+        self.documents = {}
+        self.stamps = {}  # name -> (mtime_ns, size) of the file as last read or written
+        self.dirty = set()
+        self.pending_logs = {}
+        self.changed_paths = set()  # repo-relative paths written by commits, for targeted git staging
+        self._lock = threading.RLock()
+        self.recover()
+
+    def _path(self, name):
+        return os.path.join(self.config_dir, f"{name}.json")
+
+    def _stamp(self, name):
+        try:
+            st = os.stat(self._path(name))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # --- Reading and changing state ---
+
+    def get(self, name, default=None):
+        """The document for config/<name>.json, read from disk on first use."""
+        with self._lock:
+            if name not in self.documents:
+                path = self._path(name)
+                self.stamps[name] = self._stamp(name)
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        self.documents[name] = json.load(f)
+                else:
+                    self.documents[name] = {} if default is None else default
+            return self.documents[name]
+
+    def refresh(self):
+        """Forget clean documents whose file changed on disk; they are re-read on next get(). Returns their names."""
+        with self._lock:
+            stale = [name for name in self.documents
+                     if name not in self.dirty and self._stamp(name) != self.stamps.get(name)]
+            for name in stale:
+                del self.documents[name]
+                self.stamps.pop(name, None)
+            if stale:
+                print(f"  [state] Reloading {', '.join(f'{name}.json' for name in stale)} (changed on disk)")
+            return stale
+
+    def set(self, name, value):
+        with self._lock:
+            self.documents[name] = value
+            self.dirty.add(name)
+
+    def mark_dirty(self, *names):
+        with self._lock:
+            self.dirty.update(names)
+
+    def log(self, name, *entries):
+        """Queue entries for config/<name>.jsonl; they are appended on commit."""
+        with self._lock:
+            self.pending_logs.setdefault(name, []).extend(entries)
+
+    # --- Committing ---
+
+    def _serialise(self, name):
+        return json.dumps(self.documents[name], indent=2, ensure_ascii=False,
+                          sort_keys=name in SORTED_DOCUMENTS)
+
+    def pending_paths(self):
+        """Repo-relative paths the next commit() will write."""
+        with self._lock:
+            return sorted({self._relpath(self._path(name)) for name in self.dirty}
+                          | {self._relpath(os.path.join(self.config_dir, f"{name}.jsonl")) for name in self.pending_logs})
+
+    def commit(self):
+        """Write all dirty documents and queued log entries as one batch. Returns the names written."""
+        with self._lock:
+            if not self.dirty and not self.pending_logs:
+                return []
+            os.makedirs(self.config_dir, exist_ok=True)
+            renames = []
+            for name in sorted(self.dirty):
+                final = self._path(name)
+                tmp = f"{final}.tmp"
+                _write_synced(tmp, self._serialise(name))
+                renames.append([tmp, final])
+            appends = []
+            logs = {}
+            for name, entries in self.pending_logs.items():
+                legacy = os.path.join(self.config_dir, f"{name}.json")
+                if os.path.exists(legacy):
+                    self.changed_paths.add(self._relpath(legacy))
+                logs[name] = config_log(self.repo_root, name)  # migrates a legacy .json log first
+                path = logs[name].path
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                payload = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+                appends.append([path, size, payload])
+
+            _write_synced(self.journal_path, json.dumps({"renames": renames, "appends": appends}))
+            _fsync_dir(self.config_dir)
+            self._apply(renames, appends)
+            os.remove(self.journal_path)
+            _fsync_dir(self.config_dir)
+
+            for log in logs.values():
+                archive = log.maybe_rotate()
+                if archive:
+                    self.changed_paths.add(self._relpath(archive))
+            written = [os.path.basename(final) for _, final in renames] + [os.path.basename(a[0]) for a in appends]
+            self.changed_paths.update(self._relpath(final) for _, final in renames)
+            self.changed_paths.update(self._relpath(a[0]) for a in appends)
+            for name in self.dirty:
+                self.stamps[name] = self._stamp(name)
+            self.dirty.clear()
+            self.pending_logs.clear()
+            print(f"  [state] Committed {', '.join(written)}")
+            return written
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.repo_root).replace(os.sep, "/")
+
+    @staticmethod
+    def _apply(renames, appends):
+        """Perform a journalled batch. Idempotent, so recovery can simply run it again."""
+        for tmp, final in renames:
+            if os.path.exists(tmp):
+                os.replace(tmp, final)
+        for path, size, payload in appends:
+            with open(path, "a+b") as f:
+                f.truncate(size)  # drop a partial append from an interrupted run
+                f.seek(0, os.SEEK_END)
+                f.write(payload.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def recover(self):
+        """Roll a journalled batch forward, or discard temp files of an unjournalled one."""
+        if os.path.exists(self.journal_path):
+            try:
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    journal = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                journal = None  # journal itself was torn: the batch never started applying
+            if journal is not None:
+                print("  [state] Completing an interrupted state commit")
+                self._apply(journal["renames"], journal["appends"])
+            os.remove(self.journal_path)
+            _fsync_dir(self.config_dir)
+        if os.path.isdir(self.config_dir):
+            for fname in os.listdir(self.config_dir):
+                if fname.endswith(".json.tmp"):
+                    os.remove(os.path.join(self.config_dir, fname))
+
+    def export(self, dest_dir):
+        """Write every loaded document to dest_dir/<name>.json (e.g. a snapshot for git)."""
+        with self._lock:
+            os.makedirs(dest_dir, exist_ok=True)
+            for name in self.documents:
+                path = os.path.join(dest_dir, f"{name}.json")
+                _write_synced(f"{path}.tmp", self._serialise(name))
+                os.replace(f"{path}.tmp", path)
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""Small text helpers shared by dedup, ranking and retrieval: tokenising and stop words."""
+
+import re
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers him his how i if in into is it its itself just me more most my
+no nor not now of off on once only or other our out over own same she should so some such than
+that the their them then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your vs via new
+""".split())
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9']*[a-z0-9]|[a-z0-9]")  # hyphens split: "design-mode" matches "design mode"
+
+
+def tokenize(text, min_len=2):
+    """Lowercase word tokens with stop words and very short tokens removed."""
+    return [w for w in _WORD_RE.findall((text or "").lower())
+            if len(w) >= min_len and w not in STOP_WORDS]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Prompt token estimation and per-step prompt budgets.
+
+Token counts are estimated locally as characters / chars-per-token. The
+ratio starts at a typical English value and is calibrated against the input
+token counts the API reports for each call (claude_client feeds every usage
+back through `estimator.observe`), so estimates track the real tokenizer for
+this blog's prose. The calibrated ratio persists in .cache/token_calibration.json.
+
+Prompts are assembled from named Sections with priorities; fit_sections
+trims the lowest-priority sections first until the prompt fits the step's
+budget.
+"""
+
+import json
+import math
+import os
+import threading
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+MIN_CHARS_PER_TOKEN = 2.0
+MAX_CHARS_PER_TOKEN = 8.0
+CALIBRATION_WEIGHT = 0.3  # weight of each new observation in the running ratio
+TRIM_MARKER = "\n[...]"
+
+
+def default_calibration_path(repo_root):
+    return os.path.join(repo_root, ".cache", "token_calibration.json")
+
+
+class TokenEstimator:
+    """chars/token heuristic, calibrated by observed API usage."""
+
+    def __init__(self, chars_per_token=DEFAULT_CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+        self.samples = 0
+        # While set, estimates use this ratio and observations only update
+        # chars_per_token, so a cycle's prompts don't depend on which of its
+        # calls were answered live and which from the response cache
+        self.pinned = None
+        self._lock = threading.Lock()
+
+    @property
+    def ratio(self):
+        return self.pinned or self.chars_per_token
+
+    def estimate(self, text):
+        return self.estimate_chars(len(text or ""))
+
+    def estimate_chars(self, chars):
+        return math.ceil(chars / self.ratio)
+
+    def chars_for(self, tokens):
+        return int(tokens * self.ratio)
+
+    def observe(self, chars, tokens):
+        """Fold one (prompt chars, reported input tokens) pair into the ratio."""
+        if chars <= 0 or not tokens:
+            return
+        ratio = min(MAX_CHARS_PER_TOKEN, max(MIN_CHARS_PER_TOKEN, chars / tokens))
+        with self._lock:
+            weight = 1.0 if self.samples == 0 else CALIBRATION_WEIGHT
+            self.chars_per_token += weight * (ratio - self.chars_per_token)
+            self.samples += 1
+
+    def load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.chars_per_token = float(data["chars_per_token"])
+            self.samples = int(data.get("samples", 0))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"chars_per_token": round(self.chars_per_token, 4), "samples": self.samples}, f)
+        os.replace(tmp, path)
+
+
+# Shared by every prompt builder and by claude_client's calibration
+estimator = TokenEstimator()
+
+
+def estimate_tokens(text):
+    return estimator.estimate(text)
+
+
+class Section:
+    """One named part of a prompt.
+
+    priority: higher survives longer; None means never trimmed.
+    trim: "lines" drops trailing lines (lists of items), "chars" cuts the
+    tail (free text), "drop" removes the section whole.
+    """
+
+    def __init__(self, name, text, priority=None, trim="lines"):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.trim = trim
+
+
+def _trim(section, max_tokens):
+    """Section text cut down to roughly max_tokens, or "" if nothing useful fits."""
+    if max_tokens <= 0 or section.trim == "drop":
+        return ""
+    max_chars = estimator.chars_for(max_tokens) - len(TRIM_MARKER)
+    if max_chars <= 0:
+        return ""
+    if section.trim == "chars":
+        return section.text[:max_chars] + TRIM_MARKER
+    kept = []
+    used = 0
+    for line in section.text.split("\n"):
+        if used + len(line) + 1 > max_chars:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return "\n".join(kept) + TRIM_MARKER if kept else ""
+
+
+def fit_sections(sections, budget, label="prompt"):
+    """Trim sections, lowest priority first, until their total fits `budget` tokens.
+
+    Returns {name: text}. Logs the measured size of every section and what was trimmed.
+    """
+    texts = {s.name: s.text for s in sections}
+    sizes = {s.name: estimate_tokens(s.text) for s in sections}
+    total = sum(sizes.values())
+    trimmed = []
+    trimmable = sorted((s for s in sections if s.priority is not None), key=lambda s: s.priority)
+    for section in trimmable:
+        if total <= budget:
+            break
+        allowed = sizes[section.name] - (total - budget)
+        texts[section.name] = _trim(section, allowed)
+        new_size = estimate_tokens(texts[section.name])
+        trimmed.append(f"{section.name} {sizes[section.name]}->{new_size}")
+        total -= sizes[section.name] - new_size
+        sizes[section.name] = new_size
+
+    parts = ", ".join(f"{name} {size}" for name, size in sizes.items())
+    print(f"  [budget] {label}: ~{total}/{budget} tokens ({parts})")
+    if trimmed:
+        print(f"  [budget] {label}: trimmed {'; '.join(trimmed)}")
+    if total > budget:
+        print(f"  [budget] {label}: untrimmable sections alone exceed the budget")
+    return texts
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Lightweight span tracing, written out in Chrome trace-event format.
+
+    with span("fetch", source="hn"):
+        ...
+
+Spans are only recorded between start() and stop(); otherwise span() hands
+back a shared no-op context manager, so instrumented code costs almost
+nothing outside a traced run. Each span becomes a complete ("X") event on its
+thread's track, so nesting shows up in chrome://tracing or Perfetto without
+any parent bookkeeping. summary() prints the slowest spans.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_events = None  # list of recorded events while tracing, else None
+_origin = 0.0
+_threads = {}
+
+
+class _NullSpan:
+    def __enter__(self):
+        return {}  # scratch args dict, so callers can add details either way
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enabled():
+    return _events is not None
+
+
+def start():
+    """Begin recording spans (discarding any earlier ones)."""
+    global _events, _origin
+    with _lock:
+        _events = []
+        _threads.clear()
+        _origin = time.perf_counter()
+
+
+def stop(path=None):
+    """Stop recording; write the trace to `path` if given. Returns the recorded events."""
+    global _events
+    with _lock:
+        events, _events = _events or [], None
+        threads = dict(_threads)
+    if path:
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in threads.items()]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f)
+    return events
+
+
+def span(name, cat="cycle", **args):
+    """Context manager timing one span; no-op unless tracing is on."""
+    if _events is None:
+        return _NULL_SPAN
+    return _record(name, cat, args)
+
+
+@contextmanager
+def _record(name, cat, args):
+    thread = threading.current_thread()
+    begin = time.perf_counter()
+    try:
+        yield args  # callers may add result details to args inside the span
+    finally:
+        end = time.perf_counter()
+        event = {"name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+                 "ts": round((begin - _origin) * 1e6, 1), "dur": round((end - begin) * 1e6, 1)}
+        if args:
+            event["args"] = {k: v if isinstance(v, (int, float, bool)) or v is None else str(v)
+                             for k, v in args.items()}
+        with _lock:
+            if _events is not None:
+                _events.append(event)
+                _threads.setdefault(thread.ident, thread.name)
+
+
+def summary(events, top=15):
+    """Print the slowest spans, plus per-name totals for names that occur more than once."""
+    spans = [e for e in events if e.get("ph") == "X"]
+    if not spans:
+        return
+    print(f"\n  Slowest spans (of {len(spans)}):")
+    print(f"  {'ms':>9}  {'category':<8}  span")
+    for e in sorted(spans, key=lambda e: -e["dur"])[:top]:
+        detail = ", ".join(f"{k}={v}" for k, v in e.get("args", {}).items())
+        print(f"  {e['dur'] / 1000:9.1f}  {e['cat']:<8}  {e['name']}{f' ({detail})' if detail else ''}")
+    totals = {}
+    for e in spans:
+        count, total = totals.get(e["name"], (0, 0.0))
+        totals[e["name"]] = (count + 1, total + e["dur"])
+    repeated = sorted(((t, c, n) for n, (c, t) in totals.items() if c > 1), reverse=True)[:5]
+    if repeated:
+        print("  Repeated spans: " + ", ".join(f"{n} x{c} {t / 1000:.1f}ms" for t, c, n in repeated))